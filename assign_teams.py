@@ -5,43 +5,89 @@ Uses player IDs to fetch from MLB Stats API.
 Marks players without teams as 'Free Agent'.
 """
 import csv
-import requests
-import json
+from http_retry import make_session
+from scrape_scheduler import HostRateLimiter, run_scrapes
+from team_cache import FREE_AGENT, TeamCache
 
 INPUT_CSV = 'stats (51).csv'
 OUTPUT_CSV = 'stats_with_teams_complete.csv'
 
-def get_player_team_from_api(player_id):
+# MLB Stats API batch lookups
+API_PEOPLE_URL = 'https://statsapi.mlb.com/api/v1/people'
+BATCH_SIZE = 100  # Player IDs per personIds= request
+MAX_WORKERS = 4  # Concurrent batch requests
+
+def team_from_person(person):
+    """Return the team abbreviation from a Stats API person record, or ''."""
+    # Check for current team
+    if 'currentTeam' in person:
+        team = person['currentTeam'].get('abbreviation', '')
+        if team:
+            return team
+    
+    # Check for active stats with team info
+    if 'stats' in person:
+        for stat in person['stats']:
+            if 'stat' in stat and 'team' in stat['stat']:
+                team = stat['stat']['team'].get('abbreviation', '')
+                if team:
+                    return team
+    
+    return ''
+
+def fetch_team_batch(url, session):
     """
-    Fetch player's current team from MLB Stats API.
-    Returns team abbreviation or empty string.
+    Fetch one personIds= batch. Returns dict mapping player_id -> team
+    abbreviation ('' for players the API lists without a team).
     """
-    try:
-        url = f'https://statsapi.mlb.com/api/v1/people/{player_id}'
-        response = requests.get(url, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'people' in data and len(data['people']) > 0:
-                person = data['people'][0]
-                
-                # Check for current team
-                if 'currentTeam' in person:
-                    team = person['currentTeam'].get('abbreviation', '')
-                    if team:
-                        return team
-                
-                # Check for active stats with team info
-                if 'stats' in person:
-                    for stat in person['stats']:
-                        if 'stat' in stat and 'team' in stat['stat']:
-                            team = stat['stat']['team'].get('abbreviation', '')
-                            if team:
-                                return team
-        
-        return ''
-    except:
-        return ''
+    response = session.get(url, timeout=15)
+    response.raise_for_status()
+    return {person['id']: team_from_person(person) for person in response.json().get('people', [])}
+
+def resolve_teams(player_ids, batch_size=BATCH_SIZE, max_workers=MAX_WORKERS):
+    """
+    Resolve many players' teams with batched, concurrent Stats API calls.
+    Players the API has no team for fall back to KNOWN_PLAYERS, and are
+    otherwise FREE_AGENT (from 'api': the lookup itself succeeded).
+    Returns dict mapping player_id -> (team, source) where source is
+    'api' or 'manual'; players whose batch failed are left out.
+    """
+    player_ids = sorted(set(player_ids))
+    jobs, chunks = [], {}
+    for start in range(0, len(player_ids), batch_size):
+        chunk = player_ids[start:start + batch_size]
+        url = f"{API_PEOPLE_URL}?personIds={','.join(map(str, chunk))}&hydrate=currentTeam"
+        name = f"batch {len(jobs) + 1}"
+        jobs.append((name, url))
+        chunks[name] = chunk
+    
+    resolved, looked_up = {}, set()
+    with make_session(max_workers) as session:
+        results = run_scrapes(
+            jobs,
+            lambda url: fetch_team_batch(url, session),
+            max_workers=max_workers,
+            rate_limiter=HostRateLimiter(min_interval=0),
+        )
+    for result in results.values():
+        if result.error:
+            print(f"  {result.name} failed: {result.error}")
+            continue
+        looked_up.update(chunks[result.name])
+        for player_id, team in result.value.items():
+            if team:
+                resolved[player_id] = (team, 'api')
+    
+    # Fall back to manual mapping, then record the rest as verified free agents
+    for player_id in player_ids:
+        if player_id in resolved:
+            continue
+        if player_id in KNOWN_PLAYERS:
+            resolved[player_id] = (KNOWN_PLAYERS[player_id], 'manual')
+        elif player_id in looked_up:
+            resolved[player_id] = (FREE_AGENT, 'api')
+    
+    return resolved
 
 # Fallback manual mapping for known players
 KNOWN_PLAYERS = {
@@ -110,6 +156,25 @@ KNOWN_PLAYERS = {
     573186: 'NYM',      # Stroman, Marcus
 }
 
+def refresh_teams(cache, players, batch_size=BATCH_SIZE):
+    """
+    Re-resolve only the players whose cached team is missing or stale.
+    players is a dict of player_id -> display name (or just an iterable of
+    IDs). Free agents are cached too; only players whose batch failed stay
+    missing and are retried next run. Returns the number of players looked up.
+    """
+    names = players if isinstance(players, dict) else {}
+    stale = cache.stale_ids(players)
+    if not stale:
+        return 0
+    
+    resolved = resolve_teams(stale, batch_size)
+    cache.put_many(
+        (player_id, team, source, names.get(player_id))
+        for player_id, (team, source) in resolved.items()
+    )
+    return len(stale)
+
 def main():
     print("Reading CSV...")
     
@@ -135,33 +200,33 @@ def main():
     free_agents = 0
     
     print("Fetching team information...")
-    for idx, row in enumerate(rows):
-        if idx % 100 == 0:
-            print(f"  {idx + 1}/{len(rows)}...")
-        
-        player_id_str = row[1] if len(row) > 1 else ""
-        player_name = row[0] if row else ""
-        
+    player_ids = []
+    for row in rows:
+        try:
+            player_ids.append(int(row[1]))
+        except (IndexError, ValueError):
+            pass
+    with TeamCache() as cache:
+        looked_up = refresh_teams(cache, player_ids)
+        print(f"  Looked up {looked_up} missing or stale players, {len(player_ids) - looked_up} cached")
+        resolved = cache.entries()
+    
+    for row in rows:
         team = ''
-        
         try:
-            player_id = int(player_id_str)
-            
-            # Try API first
-            team = get_player_team_from_api(player_id)
-            
-            # Fall back to manual mapping
-            if not team and player_id in KNOWN_PLAYERS:
-                team = KNOWN_PLAYERS[player_id]
-                manual_hits += 1
-            elif team:
+            team, source = resolved.get(int(row[1]), ('', ''))
+            if team == FREE_AGENT:
+                team = ''
+            elif source in ('api', 'roster'):
                 api_hits += 1
-        except:
+            elif source == 'manual':
+                manual_hits += 1
+        except (IndexError, ValueError):
             pass
         
         # Default to Free Agent if not found
         if not team:
-            team = 'Free Agent'
+            team = FREE_AGENT
             free_agents += 1
         else:
             team_counts[team] = team_counts.get(team, 0) + 1
@@ -183,7 +248,7 @@ def main():
     print(f"\n✓ Complete!")
     print(f"✓ Total players: {len(new_rows)}")
     print(f"✓ Players with teams: {total_with_teams}")
-    print(f"  - From API: {api_hits}")
+    print(f"  - From API/rosters: {api_hits}")
     print(f"  - From manual mapping: {manual_hits}")
     print(f"✓ Free Agents: {free_agents}")
     
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Crash-safe output files.
+Every write goes to a temp file in the target's folder, is fsynced and
+then renamed over the target, so readers (and a run killed mid-write)
+only ever see the old file or the complete new one.
+- write_text_atomic / write_bytes_atomic: one file
+- OutputGeneration: stage all of a run's outputs in a hidden folder and
+  publish them together once the whole run has succeeded
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+GENERATION_PREFIX = '.generation-'
+
+# Read once at import: os.umask can only be read by setting it, which races with threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _fsync_directory(directory):
+    """Persist a rename in directory (POSIX only; Windows has no directory handles)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def write_bytes_atomic(path, data):
+    """Write bytes to a temp file next to path, fsync it, then rename it over path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the target's mode, or a normal new file's
+        try:
+            mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    _fsync_directory(path.parent)
+    return path
+
+def write_text_atomic(path, text, encoding='utf-8'):
+    """write_bytes_atomic for text; newlines are written exactly as given."""
+    return write_bytes_atomic(path, text.encode(encoding))
+
+class OutputGeneration:
+    """
+    One run's outputs, staged under root/.generation-*/ with the same
+    relative paths as their targets and moved into place by publish().
+    Files in subfolders (the hashed assets pages point at) are published
+    before top-level files, so a page never goes live ahead of its data.
+    Used as a context manager it publishes on success and discards the
+    staged files if the run raises.
+    """
+    def __init__(self, root):
+        self.root = Path(root)
+        self.staging = Path(tempfile.mkdtemp(dir=self.root, prefix=GENERATION_PREFIX))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.publish()
+        else:
+            self.discard()
+
+    def path(self, target):
+        """Where to write target (a path under root) for this generation."""
+        return self.staging / Path(target).resolve().relative_to(self.root.resolve())
+
+    def staged_files(self):
+        """Staged files relative to root, in publish order."""
+        files = [path.relative_to(self.staging) for path in self.staging.rglob('*') if path.is_file()]
+        return sorted(files, key=lambda path: (len(path.parts) == 1, str(path)))
+
+    def publish(self):
+        """Move every staged file over its target; returns the published paths."""
+        published = []
+        for relative in self.staged_files():
+            source = self.staging / relative  # Already fsynced by write_bytes_atomic
+            target = self.root / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(source, target)
+            published.append(target)
+        for directory in {target.parent for target in published}:
+            _fsync_directory(directory)
+        self.discard()
+        return published
+
+    def discard(self):
+        shutil.rmtree(self.staging, ignore_errors=True)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Shared headless Chrome session for Savant scrapes.
+- Starts one driver lazily and reuses it for every URL in a run
+- Health-checks the driver before each use
+- Restarts it automatically if the browser has crashed
+- BrowserPool hands out a few sessions to concurrent scrapes
+- wait_for_table_ready waits for rendering to finish instead of sleeping
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+DEFAULT_ARGUMENTS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+)
+
+# Table readiness polling
+READY_POLL_INTERVAL = 0.25  # Seconds between row counts
+READY_STABLE_FOR = 1.0  # Row count must hold this long to count as rendered
+
+# Resolved once per process so restarts skip the driver-manager check
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+def get_driver_path():
+    """Return the chromedriver path, installing it on first use."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+    return _driver_path
+
+class BrowserSession:
+    """A reusable Chrome driver that restarts itself when it dies."""
+    def __init__(self, headless=True, arguments=DEFAULT_ARGUMENTS, max_restarts=3):
+        self.headless = headless
+        self.arguments = list(arguments)
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self._driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.quit()
+
+    def _start(self):
+        options = webdriver.ChromeOptions()
+        for argument in self.arguments:
+            options.add_argument(argument)
+        if self.headless:
+            options.add_argument('--headless')  # Run in background
+
+        service = Service(get_driver_path())
+        return webdriver.Chrome(service=service, options=options)
+
+    def is_alive(self):
+        """Check that the browser still answers WebDriver commands."""
+        if self._driver is None:
+            return False
+        try:
+            self._driver.current_window_handle
+            return True
+        except WebDriverException:
+            return False
+
+    def restart(self):
+        """Throw away the current driver and start a fresh one."""
+        if self.restarts >= self.max_restarts:
+            raise RuntimeError(f'Browser restarted {self.restarts} times, giving up')
+        self.restarts += 1
+        self.quit()
+        self._driver = self._start()
+        return self._driver
+
+    @property
+    def driver(self):
+        """Return a healthy driver, starting or restarting it as needed."""
+        if self._driver is None:
+            self._driver = self._start()
+        elif not self.is_alive():
+            print('Browser session is unresponsive, restarting...')
+            self.restart()
+        return self._driver
+
+    def get(self, url):
+        """Load a URL, restarting the browser once if it crashes mid-load."""
+        try:
+            self.driver.get(url)
+        except WebDriverException:
+            if self.is_alive():
+                raise
+            print('Browser crashed while loading page, restarting...')
+            self.restart().get(url)
+        return self._driver
+
+    def quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except WebDriverException:
+                pass
+            self._driver = None
+
+class BrowserPool:
+    """A fixed number of BrowserSessions shared between worker threads."""
+    def __init__(self, size=2, **session_options):
+        self.size = size
+        self._sessions = [BrowserSession(**session_options) for _ in range(size)]
+        # LIFO so a run with fewer jobs than sessions only starts what it needs
+        self._idle = queue.LifoQueue()
+        for session in self._sessions:
+            self._idle.put(session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.quit()
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a session for the duration of a with-block."""
+        session = self._idle.get()
+        try:
+            yield session
+        finally:
+            self._idle.put(session)
+
+    def quit(self):
+        for session in self._sessions:
+            session.quit()
+
+def wait_for_table_ready(driver, timeout=60, ready_selector=None,
+                         stable_for=READY_STABLE_FOR, poll=READY_POLL_INTERVAL):
+    """
+    Wait until the page's first <table> has finished rendering.
+    The table counts as ready once ready_selector (a CSS data-ready marker)
+    is present, or once its row count has stopped changing for stable_for
+    seconds. Returns (table, seconds_waited, row_count) and raises
+    TimeoutException if neither happens within timeout.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    table = WebDriverWait(driver, timeout).until(
+        EC.presence_of_element_located((By.TAG_NAME, 'table')))
+    
+    last_count = -1
+    stable_since = time.monotonic()
+    while True:
+        now = time.monotonic()
+        try:
+            count = driver.execute_script('return arguments[0].rows.length;', table)
+        except StaleElementReferenceException:
+            # Table was re-rendered; pick up the new element (if it is back yet)
+            # and count it on the next poll, which also restarts the stability clock
+            count = None
+            last_count = -1
+            try:
+                table = driver.find_element(By.TAG_NAME, 'table')
+            except NoSuchElementException:
+                pass
+        
+        if count is not None:
+            if ready_selector and driver.find_elements(By.CSS_SELECTOR, ready_selector):
+                break
+            if count != last_count:
+                last_count = count
+                stable_since = now
+            elif count > 1 and now - stable_since >= stable_for:
+                break
+        
+        if now >= deadline:
+            raise TimeoutException(
+                f'Table still changing after {timeout}s ({max(last_count, 0)} rows so far)')
+        time.sleep(poll)
+    
+    seconds = time.monotonic() - start
+    print(f"  Table ready after {seconds:.1f}s ({count} rows)")
+    return table, seconds, count
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Build the combined velocity / pitch mix dashboard (index.html).
+One page with a toggle between the two views, using the same template,
+stylesheet and script as the single-view dashboards. Both leaderboards
+are joined on (player_id, year) into one dataset, so the page loads each
+season once and the toggle only switches columns.
+Import build() to render from already-loaded PitcherSeasonTables, or run
+this file (--force to ignore the build manifest, --inline for a single
+self-contained file) to build it from the latest scrapes in the pitch
+warehouse.
+"""
+from pathlib import Path
+import build_dashboard
+import build_pitch_mix_dashboard
+from build_dashboard import LEADERBOARD as VELOCITY_LEADERBOARD, VELOCITY_VIEW
+from build_pitch_mix_dashboard import LEADERBOARD as PITCH_MIX_LEADERBOARD, PITCH_MIX_VIEW
+from dashboard_builder import builder_version, run_builder
+from dashboard_template import DEFAULT_MODE, DashboardPage, render_dashboard
+from pitcher_data import join_tables
+
+WORKSPACE = Path(__file__).parent
+# The view definitions live in the single-view builders
+TEMPLATE_VERSION = builder_version(__file__, build_dashboard.__file__, build_pitch_mix_dashboard.__file__)
+OUTPUT_PATH = WORKSPACE / 'index.html'
+
+PAGE = DashboardPage(
+    title='MLB Pitcher Dashboard - Velocity & Pitch Mix',
+    heading='⚾ MLB Pitcher Statistics',
+    footer='Data sourced from Baseball Savant ({seasons}) • Updated {updated}',
+    # Views read their columns of the joined table by view id
+    views=[VELOCITY_VIEW._replace(prefix=f'{VELOCITY_VIEW.id}.'), PITCH_MIX_VIEW._replace(prefix=f'{PITCH_MIX_VIEW.id}.')],
+    header_html="""
+        <div class="github-link">
+            <a href="https://github.com/billypdk/Pitcher-Dashboard" target="_blank">View on GitHub ↗</a>
+        </div>""",
+)
+
+def build(mix_table, velocity_table, output_path=OUTPUT_PATH, mode=DEFAULT_MODE, movers=None, updated=None):
+    """
+    Render the combined dashboard for both tables and write it to output_path.
+    movers maps leaderboard name -> biggest movers to list above the table;
+    updated is the newest scrape's date for the footer.
+    """
+    movers = movers or {}
+    joined = join_tables({VELOCITY_VIEW.id: velocity_table, PITCH_MIX_VIEW.id: mix_table})
+    return render_dashboard(
+        PAGE, [joined], output_path, mode,
+        [movers.get(VELOCITY_LEADERBOARD), movers.get(PITCH_MIX_LEADERBOARD)],
+        updated,
+    )
+
+if __name__ == '__main__':
+    run_builder(build, [PITCH_MIX_LEADERBOARD, VELOCITY_LEADERBOARD], OUTPUT_PATH, TEMPLATE_VERSION)
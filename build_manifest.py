@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest for dashboard builds.
+Records, per output file, the warehouse version of every leaderboard it
+reads and the template version (a SHA-256 over the builder and template
+sources) it was built from, so builders can skip outputs whose inputs
+have not changed since the last build.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from atomic_output import write_text_atomic
+
+MANIFEST_PATH = Path(__file__).parent / 'dashboard_manifest.json'
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_digest(*paths):
+    """One SHA-256 over several source files, e.g. a builder and its template."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(file_digest(path).encode('ascii'))
+    return digest.hexdigest()
+
+class BuildManifest:
+    """Which inputs and template version each output was last built from."""
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def is_current(self, output_path, inputs, template_version):
+        """True if output_path exists and was built from exactly these inputs and template."""
+        output_path = Path(output_path)
+        entry = self.entries.get(output_path.name)
+        return (
+            output_path.exists()
+            and entry is not None
+            and entry.get('inputs') == inputs
+            and entry.get('template_version') == template_version
+        )
+
+    def record(self, output_path, inputs, template_version):
+        self.entries[Path(output_path).name] = {
+            'inputs': inputs,
+            'template_version': template_version,
+        }
+
+    def save(self, path=None):
+        """Write the manifest atomically to path (default: where it was loaded from)."""
+        write_text_atomic(path or self.path, json.dumps(self.entries, indent=2, sort_keys=True))
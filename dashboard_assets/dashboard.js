@@ -0,0 +1,486 @@
+// Shared script for the pitcher dashboards.
+// Each page carries a #dashboardConfig block listing its views; every view
+// has one columnar payload per season (built by PitcherSeasonTable.to_payload),
+// either inline in a <script type="application/json"> block or fetched from
+// the file named in that block's data-src attribute (or its gzipped copy in
+// data-src-gzip, when the browser has DecompressionStream). Only the seasons
+// the Year filter asks for are parsed or fetched. Views may share one joined
+// payload (pitcher_data.join_tables), each reading its own prefixed columns.
+
+// Virtual scrolling: only rows inside .table-wrapper's viewport get DOM nodes
+const OVERSCAN = 10;  // Extra rows rendered above and below the viewport
+const SEARCH_DEBOUNCE_MS = 150;
+const PITCH_COLUMNS = ['FB', 'SL', 'CH', 'CB', 'SNK', 'CUT', 'SPLT', 'KN', 'SWP', 'SLV', 'FRK'];
+
+let config = null;
+let currentView = null;
+let loadedSeasons = {};  // data element id -> hydrated season payload
+let mergedSeasons = {};  // data element ids -> payload covering those seasons
+let data = null;       // payload on screen: data.columns[column][row]
+let selected = null;   // selected[row] is 1 when the row passes the filters
+let filteredRows = [];
+let currentSort = { column: 'player', direction: 'asc' };
+let rowHeight = 38;    // px, replaced by a measured row after the first render
+let renderQueued = false;
+let searchTimer = null;
+
+// The current view's name for a table column: pitch columns carry its prefix
+function column(name) {
+    return PITCH_COLUMNS.includes(name) ? currentView.prefix + name : name;
+}
+
+function decodeBase64(text) {
+    const binary = atob(text);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes;
+}
+
+function hydrate(payload) {
+    payload.teamNames = payload.dictionaries.team;
+    payload.teamCodes = {};
+    payload.teamNames.forEach((team, code) => {
+        payload.teamCodes[team] = code;
+    });
+
+    // Prebuilt filter index: row bitmaps per team and year, name codes per row
+    payload.teamBitmaps = payload.index.team.map(decodeBase64);
+    payload.yearBitmaps = {};
+    Object.keys(payload.index.year).forEach(year => {
+        payload.yearBitmaps[year] = decodeBase64(payload.index.year[year]);
+    });
+    // Joined payloads: rows each view's leaderboard has
+    payload.presentBitmaps = {};
+    Object.keys(payload.index.present || {}).forEach(view => {
+        payload.presentBitmaps[view] = decodeBase64(payload.index.present[view]);
+    });
+
+    // Prebuilt ascending sort permutation per column, missing values last
+    const ArrayType = payload.sort.dtype === 'uint32' ? Uint32Array : Uint16Array;
+    payload.sortOrders = {};
+    Object.keys(payload.sort.order).forEach(column => {
+        payload.sortOrders[column] = new ArrayType(decodeBase64(payload.sort.order[column]).buffer);
+    });
+    return payload;
+}
+
+function fetchBytes(source) {
+    return fetch(source).then(response => {
+        if (!response.ok) throw new Error(`Could not load ${source}: ${response.status}`);
+        return response.arrayBuffer();
+    }).then(buffer => new Uint8Array(buffer));
+}
+
+function gunzipText(bytes) {
+    // A server that sends .gz files with Content-Encoding: gzip has already decompressed them
+    if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) {
+        return Promise.resolve(new TextDecoder().decode(bytes));
+    }
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return new Response(stream).text();
+}
+
+function loadViewText(element) {
+    const gzipSource = element.getAttribute('data-src-gzip');
+    if (gzipSource && typeof DecompressionStream !== 'undefined') {
+        return fetchBytes(gzipSource).then(gunzipText);
+    }
+    const source = element.getAttribute('data-src');
+    if (source) {
+        return fetchBytes(source).then(bytes => new TextDecoder().decode(bytes));
+    }
+    return Promise.resolve(element.textContent);
+}
+
+function loadSeason(elementId) {
+    if (!loadedSeasons[elementId]) {
+        loadedSeasons[elementId] = loadViewText(document.getElementById(elementId))
+            .then(json => hydrate(JSON.parse(json)));
+    }
+    return loadedSeasons[elementId];
+}
+
+// year is a season or '' for all of the view's seasons. Keyed by the data
+// blocks read, so views sharing a joined payload share the merge too.
+function loadSeasons(view, year) {
+    const seasons = view.seasons.filter(season => year === '' || String(season.year) === year);
+    const key = seasons.map(season => season.data).join(',');
+    if (!mergedSeasons[key]) {
+        mergedSeasons[key] = Promise.all(seasons.map(season => loadSeason(season.data))).then(mergeSeasons);
+    }
+    return mergedSeasons[key];
+}
+
+function setBit(bitmap, row) {
+    bitmap[row >> 3] |= 1 << (row & 7);
+}
+
+function getBit(bitmap, row) {
+    return (bitmap[row >> 3] >> (row & 7)) & 1;
+}
+
+// One payload over several seasons: columns concatenated, teams recoded into a
+// shared dictionary, bitmaps rebuilt and the per-season sort orders merged
+function mergeSeasons(parts) {
+    if (parts.length === 1) return parts[0];
+
+    const offsets = [];
+    let rows = 0;
+    parts.forEach(part => {
+        offsets.push(rows);
+        rows += part.rows;
+    });
+
+    const teamNames = [...new Set(parts.flatMap(part => part.teamNames))].sort();
+    const teamCodes = {};
+    teamNames.forEach((team, code) => {
+        teamCodes[team] = code;
+    });
+
+    const columns = {};
+    Object.keys(parts.length ? parts[0].columns : {}).forEach(column => {
+        columns[column] = column === 'team'
+            ? parts.flatMap(part => part.columns.team.map(code => teamCodes[part.teamNames[code]]))
+            : parts.flatMap(part => part.columns[column]);
+    });
+
+    const bytes = Math.ceil(rows / 8);
+    const teamBitmaps = teamNames.map(() => new Uint8Array(bytes));
+    const yearBitmaps = {};
+    for (let row = 0; row < rows; row++) {
+        setBit(teamBitmaps[columns.team[row]], row);
+        const year = columns.year[row];
+        if (!yearBitmaps[year]) yearBitmaps[year] = new Uint8Array(bytes);
+        setBit(yearBitmaps[year], row);
+    }
+    const presentBitmaps = {};
+    Object.keys(parts[0].presentBitmaps).forEach(view => {
+        presentBitmaps[view] = new Uint8Array(bytes);
+        parts.forEach((part, k) => {
+            for (let row = 0; row < part.rows; row++) {
+                if (getBit(part.presentBitmaps[view], row)) setBit(presentBitmaps[view], offsets[k] + row);
+            }
+        });
+    });
+
+    // Each season keeps its own distinct-name list; shift its name codes past the earlier ones
+    const search = [];
+    const nameCodes = [];
+    parts.forEach(part => {
+        const base = search.length;
+        search.push(...part.index.search);
+        part.index.name_code.forEach(code => nameCodes.push(base + code));
+    });
+
+    const sortOrders = {};
+    const valid = {};
+    Object.keys(parts.length ? parts[0].sortOrders : {}).forEach(column => {
+        sortOrders[column] = mergeSortOrders(parts, offsets, rows, columns[column], column);
+        valid[column] = parts.reduce((total, part) => total + part.sort.valid[column], 0);
+    });
+
+    return {
+        rows, columns, teamNames, teamCodes, teamBitmaps, yearBitmaps, presentBitmaps, sortOrders,
+        index: { search, name_code: nameCodes },
+        sort: { valid }
+    };
+}
+
+// Missing values sort last; ties keep the earlier season's rows first
+function sortsBefore(a, b) {
+    if (a === null) return false;
+    if (b === null) return true;
+    return a < b;
+}
+
+// k-way merge of the seasons' ascending permutations into merged row numbers.
+// Merged team codes follow the sorted dictionary, so they compare like the names.
+function mergeSortOrders(parts, offsets, rows, values, column) {
+    const heads = parts.map(() => 0);
+    const order = new Uint32Array(rows);
+    for (let out = 0; out < order.length; out++) {
+        let best = -1;
+        let bestRow = 0;
+        for (let k = 0; k < parts.length; k++) {
+            if (heads[k] >= parts[k].rows) continue;
+            const row = offsets[k] + parts[k].sortOrders[column][heads[k]];
+            if (best === -1 || sortsBefore(values[row], values[bestRow])) {
+                best = k;
+                bestRow = row;
+            }
+        }
+        order[out] = bestRow;
+        heads[best]++;
+    }
+    return order;
+}
+
+function formatValue(value) {
+    return value === null ? '-' : value;
+}
+
+function initializeData() {
+    config = JSON.parse(document.getElementById('dashboardConfig').textContent);
+
+    // Add event listeners
+    document.getElementById('searchInput').addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(applyFilters, SEARCH_DEBOUNCE_MS);
+    });
+    document.getElementById('teamFilter').addEventListener('change', applyFilters);
+    document.getElementById('yearFilter').addEventListener('change', showSeasons);
+    document.getElementById('tableWrapper').addEventListener('scroll', queueRender);
+    window.addEventListener('resize', queueRender);
+
+    // Open on the newest season; older ones load when picked
+    return switchView(config.views[0].id, newestSeason(config.views[0]));
+}
+
+function newestSeason(view) {
+    return view.seasons.length ? String(view.seasons[0].year) : '';
+}
+
+// year defaults to the Year filter's current choice
+function switchView(viewId, year) {
+    currentView = config.views.find(v => v.id === viewId);
+
+    // Update button states, info text and the movers table shown
+    document.querySelectorAll('.toggle-btn').forEach(btn => {
+        btn.classList.toggle('active', btn.getAttribute('data-view') === viewId);
+    });
+    document.getElementById('infoText').textContent = currentView.info;
+    document.querySelectorAll('.movers').forEach(section => {
+        section.hidden = section.getAttribute('data-view') !== viewId;
+    });
+
+    const yearFilter = document.getElementById('yearFilter');
+    replaceOptions(
+        yearFilter,
+        currentView.seasons.map(season => String(season.year)),
+        year === undefined ? yearFilter.value : year,
+        newestSeason(currentView)
+    );
+    return showSeasons();
+}
+
+// Load the seasons the Year filter asks for, then filter and draw them
+function showSeasons() {
+    const view = currentView;
+    const year = document.getElementById('yearFilter').value;
+    return loadSeasons(view, year).then(payload => {
+        // Ignore loads that finished after the user moved on
+        if (view !== currentView || year !== document.getElementById('yearFilter').value) return;
+        data = payload;
+        const teamFilter = document.getElementById('teamFilter');
+        replaceOptions(teamFilter, data.teamNames, teamFilter.value, '');
+        applyFilters();
+    }).catch(error => {
+        document.getElementById('tableBody').innerHTML =
+            `<tr><td colspan="15" class="no-data">${error.message}</td></tr>`;
+    });
+}
+
+function replaceOptions(select, values, chosen, fallback) {
+    // Keep the "All" option, and the chosen value if it is still offered
+    select.length = 1;
+    values.forEach(value => {
+        const option = document.createElement('option');
+        option.value = value;
+        option.textContent = value;
+        select.appendChild(option);
+    });
+    select.value = chosen === '' || values.includes(chosen) ? chosen : fallback;
+}
+
+function updateStats() {
+    const teams = data.columns.team;
+    const fastballs = data.columns[column('FB')];
+    const teamSet = new Set();
+    let fastballSum = 0;
+    let fastballCount = 0;
+    for (const row of filteredRows) {
+        teamSet.add(teams[row]);
+        if (fastballs[row] !== null) {
+            fastballSum += fastballs[row];
+            fastballCount++;
+        }
+    }
+
+    const stats = {
+        total: filteredRows.length,
+        teams: teamSet.size,
+        avgFastball: (fastballSum / fastballCount).toFixed(1)
+    };
+
+    document.getElementById('statsContainer').innerHTML = `
+        <div class="stat-card">
+            <div class="number">${stats.total}</div>
+            <div class="label">Pitcher Records</div>
+        </div>
+        <div class="stat-card">
+            <div class="number">${stats.teams}</div>
+            <div class="label">Teams</div>
+        </div>
+        <div class="stat-card">
+            <div class="number">${stats.avgFastball}${currentView.avgSuffix}</div>
+            <div class="label">${currentView.avgLabel}</div>
+        </div>
+    `;
+}
+
+function applyFilters() {
+    if (!data) return;
+    const searchTerm = document.getElementById('searchInput').value.trim().toLowerCase();
+    const teamValue = document.getElementById('teamFilter').value;
+    const yearValue = document.getElementById('yearFilter').value;
+
+    // Intersect the team and year bitmaps, and the view's rows of a joined payload
+    const mask = new Uint8Array(Math.ceil(data.rows / 8)).fill(255);
+    for (const bitmap of [
+        teamValue === '' ? null : data.teamBitmaps[data.teamCodes[teamValue]],
+        yearValue === '' ? null : data.yearBitmaps[yearValue],
+        data.presentBitmaps[currentView.id]
+    ]) {
+        if (!bitmap) continue;
+        for (let i = 0; i < mask.length; i++) {
+            mask[i] &= bitmap[i];
+        }
+    }
+
+    // Match the search term once per distinct name, not once per row
+    let nameMatch = null;
+    if (searchTerm) {
+        nameMatch = new Uint8Array(data.index.search.length);
+        data.index.search.forEach((name, code) => {
+            nameMatch[code] = name.includes(searchTerm) ? 1 : 0;
+        });
+    }
+    const nameCodes = data.index.name_code;
+
+    selected = new Uint8Array(data.rows);
+    for (let byte = 0; byte < mask.length; byte++) {
+        let bits = mask[byte];
+        while (bits) {
+            const bit = 31 - Math.clz32(bits & -bits);
+            bits &= bits - 1;
+            const row = byte * 8 + bit;
+            if (row >= data.rows) break;
+            if (!nameMatch || nameMatch[nameCodes[row]]) {
+                selected[row] = 1;
+            }
+        }
+    }
+
+    orderRows();
+    updateStats();
+    renderTable();
+}
+
+// Walk the current column's prebuilt permutation, keeping selected rows.
+// Descending walks it backwards one run of equal values at a time, so tied
+// rows keep their ascending (stable) order and missing values stay last.
+function orderRows() {
+    const name = column(currentSort.column);
+    const order = data.sortOrders[name] || [];
+    const valid = data.sort.valid[name];
+    const values = data.columns[name];
+    filteredRows = [];
+    if (currentSort.direction === 'asc') {
+        for (let i = 0; i < order.length; i++) {
+            if (selected[order[i]]) filteredRows.push(order[i]);
+        }
+    } else {
+        for (let end = valid - 1; end >= 0;) {
+            let start = end;
+            while (start > 0 && values[order[start - 1]] === values[order[end]]) start--;
+            for (let i = start; i <= end; i++) {
+                if (selected[order[i]]) filteredRows.push(order[i]);
+            }
+            end = start - 1;
+        }
+        for (let i = valid; i < order.length; i++) {
+            if (selected[order[i]]) filteredRows.push(order[i]);
+        }
+    }
+}
+
+function sortTable(column) {
+    if (currentSort.column === column) {
+        currentSort.direction = currentSort.direction === 'asc' ? 'desc' : 'asc';
+    } else {
+        currentSort.column = column;
+        currentSort.direction = 'asc';
+    }
+
+    orderRows();
+    renderTable();
+}
+
+function renderRow(row) {
+    const c = data.columns;
+    const team = data.teamNames[c.team[row]];
+    const teamClass = team === 'Free Agent' ? 'free-agent' : '';
+    return `
+        <tr>
+            <td>${c.player[row]}</td>
+            <td><span class="team ${teamClass}">${team}</span></td>
+            <td class="number">${c.year[row]}</td>
+            <td class="number">${c.pitch_count[row]}</td>
+            ${PITCH_COLUMNS.map(code => `<td class="number">${formatValue(c[column(code)][row])}</td>`).join('')}
+        </tr>
+    `;
+}
+
+function spacerRow(height) {
+    return height > 0 ? `<tr class="spacer"><td colspan="15" style="height: ${height}px"></td></tr>` : '';
+}
+
+function renderTable() {
+    const tbody = document.getElementById('tableBody');
+    const wrapper = document.getElementById('tableWrapper');
+
+    if (filteredRows.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="15" class="no-data">No pitchers found</td></tr>';
+        return;
+    }
+
+    // Window of rows around the scroll position; spacers keep the scrollbar honest
+    const windowSize = Math.ceil(wrapper.clientHeight / rowHeight) + 2 * OVERSCAN;
+    const first = Math.max(0, Math.min(
+        Math.floor(wrapper.scrollTop / rowHeight) - OVERSCAN,
+        filteredRows.length - windowSize
+    ));
+    const last = Math.min(filteredRows.length, first + windowSize);
+
+    tbody.innerHTML = spacerRow(first * rowHeight)
+        + filteredRows.slice(first, last).map(renderRow).join('')
+        + spacerRow((filteredRows.length - last) * rowHeight);
+
+    // Use the real row height once the browser has laid one out
+    const sample = tbody.querySelector('tr:not(.spacer)');
+    if (sample && sample.offsetHeight && sample.offsetHeight !== rowHeight) {
+        rowHeight = sample.offsetHeight;
+        queueRender();
+    }
+}
+
+function queueRender() {
+    if (renderQueued) return;
+    renderQueued = true;
+    requestAnimationFrame(() => {
+        renderQueued = false;
+        renderTable();
+    });
+}
+
+function resetFilters() {
+    document.getElementById('searchInput').value = '';
+    document.getElementById('teamFilter').value = '';
+    document.getElementById('yearFilter').value = newestSeason(currentView);
+    showSeasons();
+}
+
+// Initialize on page load
+window.addEventListener('load', initializeData);
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point shared by the dashboard builders.
+A builder run from the command line reads its leaderboards' latest
+snapshots from the pitch warehouse and rebuilds its page, unless the
+build manifest shows the same inputs and template version were already
+built (--force rebuilds anyway, --inline writes a self-contained file).
+"""
+
+import sys
+
+from build_manifest import BuildManifest, source_digest
+from dashboard_template import DEFAULT_MODE, TEMPLATE_FILES
+from pitch_deltas import latest_movers
+from pitch_warehouse import PitchWarehouse
+
+def builder_version(*sources):
+    """Digest of a builder's source files and the shared template; any edit invalidates older outputs."""
+    return source_digest(*sources, *TEMPLATE_FILES)
+
+def run_builder(build, leaderboards, output_path, template_version, argv=None):
+    """
+    Build output_path with build(*tables, output_path, mode, movers, updated),
+    one table per leaderboard in the order build() takes them.
+    """
+    argv = sys.argv if argv is None else argv
+    mode = 'inline' if '--inline' in argv else DEFAULT_MODE
+    version = f'{template_version}:{mode}'
+    manifest = BuildManifest()
+    with PitchWarehouse() as warehouse:
+        inputs = {name: warehouse.version(name) for name in leaderboards}
+        if '--force' not in argv and manifest.is_current(output_path, inputs, version):
+            print(f"Inputs unchanged, skipping {output_path.name} (use --force to rebuild)")
+            return
+        tables = [warehouse.snapshot(name) for name in leaderboards]
+        movers = {name: latest_movers(warehouse, name) for name in leaderboards}
+        updated = warehouse.last_updated(leaderboards)
+    
+    build(*tables, output_path, mode, movers, updated)
+    manifest.record(output_path, inputs, version)
+    manifest.save()
+    print(f"Dashboard created successfully: {output_path}")
+    print(f"Total pitcher rows processed: {sum(len(table) for table in tables)}")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Hot-fix rows in an already generated dashboard without rebuilding it.
+Finds a view's per-season data blocks through the page's #dashboardConfig,
+upserts rows keyed on (player_id, year), or (Player Name, Team, year) for
+rows without an id, and rewrites only the seasons that changed:
+- inline pages get just those <script> blocks replaced
+- published pages get new content-hashed data files for those seasons;
+  every other season keeps its file (and browser cache)
+Pages are written atomically (atomic_output), so a failed patch never
+leaves a half-written dashboard.
+
+Usage: python dashboard_patch.py <page.html> <view id> <rows.csv>
+"""
+
+import json
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from atomic_output import write_text_atomic
+from dashboard_template import OUTPUT_ASSET_DIR, write_data_assets
+from pitcher_data import PitcherSeasonTable, load_table
+
+DATA_BLOCK = re.compile(
+    r'<script type="application/json" id="(?P<id>[^"]+)"(?P<attrs>[^>]*)>(?P<body>.*?)</script>',
+    re.DOTALL,
+)
+DATA_SOURCE = re.compile(r'data-src="(?P<src>[^"]+)"')
+
+# One <script type="application/json"> block: its span in the page, attributes and text
+DataBlock = namedtuple('DataBlock', 'id start end attrs body')
+
+def find_data_blocks(html_text):
+    """Return element id -> DataBlock for every JSON block in a page."""
+    return {
+        match['id']: DataBlock(match['id'], match.start(), match.end(), match['attrs'], match['body'])
+        for match in DATA_BLOCK.finditer(html_text)
+    }
+
+def upsert_rows(table, updates, prefix=''):
+    """
+    Return (table with updates applied, rows updated, rows added).
+    Matched rows get the updates' pitch count and pitch columns (written to
+    prefix + code, for a joined table); unmatched rows are appended.
+    """
+    by_id = {
+        (pid, year): i
+        for i, (pid, year) in enumerate(zip(table.player_id.tolist(), table.year.tolist()))
+        if pid
+    }
+    by_name = {
+        (name, team, year): i
+        for i, (name, team, year) in enumerate(zip(table.names, table.teams, table.year.tolist()))
+    }
+    rows = []
+    for name, team, pid, year in zip(updates.names, updates.teams, updates.player_id.tolist(), updates.year.tolist()):
+        row = by_id.get((pid, year)) if pid else None
+        if row is None:
+            row = by_name.get((name, team, year))
+        rows.append(-1 if row is None else row)
+    rows = np.array(rows, dtype=np.int64)
+    matched = rows >= 0
+
+    patched = table.take(np.arange(len(table)))
+    patched.pitch_count[rows[matched]] = updates.pitch_count[matched]
+    for code, values in updates.pitches.items():
+        if prefix + code in patched.pitches:
+            patched.pitches[prefix + code][rows[matched]] = values[matched]
+
+    added = updates.take(~matched)
+    added = PitcherSeasonTable(
+        names=added.names,
+        teams=added.teams,
+        player_id=added.player_id,
+        year=added.year,
+        pitch_count=added.pitch_count,
+        pitches={prefix + code: values for code, values in added.pitches.items()},
+        columns=list(table.pitches),
+    )
+    return PitcherSeasonTable.concat([patched, added]), int(matched.sum()), len(added)
+
+def _read_block(page_dir, block):
+    """A data block's payload, from its data-src file or its inline text."""
+    source = DATA_SOURCE.search(block.attrs)
+    if source:
+        return json.loads((page_dir / source['src']).read_text(encoding='utf-8'))
+    return json.loads(block.body)
+
+def _patched_block(page_dir, block, payload):
+    """The block's new tag: inline text, or data-src pointing at a new data file."""
+    source = DATA_SOURCE.search(block.attrs)
+    if not source:
+        return f'<script type="application/json" id="{block.id}"{block.attrs}>{payload}</script>'
+    stem = Path(source['src']).name.split('.', 1)[0]
+    data_name, gzip_name = write_data_assets(page_dir / OUTPUT_ASSET_DIR, stem, payload)
+    return (
+        f'<script type="application/json" id="{block.id}" '
+        f'data-src="{OUTPUT_ASSET_DIR}/{data_name}" '
+        f'data-src-gzip="{OUTPUT_ASSET_DIR}/{gzip_name}"></script>'
+    )
+
+def patch_view(html_path, view_id, updates):
+    """
+    Upsert a PitcherSeasonTable into one view of a generated dashboard.
+    Every season in updates must already be on the page. Returns
+    (rows updated, rows added).
+    """
+    html_path = Path(html_path)
+    page_dir = html_path.parent
+    html_text = html_path.read_text(encoding='utf-8')
+    blocks = find_data_blocks(html_text)
+    if 'dashboardConfig' not in blocks:
+        raise ValueError(f'{html_path.name} is not a generated dashboard (no dashboardConfig block)')
+    config = json.loads(blocks['dashboardConfig'].body)
+    view = next((view for view in config['views'] if view['id'] == view_id), None)
+    if view is None:
+        raise ValueError(f"No view {view_id!r} in {html_path.name}; views: {[v['id'] for v in config['views']]}")
+
+    season_blocks = {season['year']: blocks[season['data']] for season in view['seasons']}
+    missing = sorted(set(updates.seasons()) - set(season_blocks))
+    if missing:
+        raise ValueError(f'Seasons {missing} are not on {html_path.name}; rebuild it instead')
+
+    replacements = []
+    updated = added = 0
+    for year in updates.seasons():
+        block = season_blocks[year]
+        table = PitcherSeasonTable.from_payload(_read_block(page_dir, block))
+        table, season_updated, season_added = upsert_rows(table, updates.season(year), view.get('prefix', ''))
+        replacements.append((block, _patched_block(page_dir, block, table.to_payload_json())))
+        updated += season_updated
+        added += season_added
+
+    # Splice from the end so earlier offsets stay valid
+    for block, tag in sorted(replacements, key=lambda item: item[0].start, reverse=True):
+        html_text = html_text[:block.start] + tag + html_text[block.end:]
+    write_text_atomic(html_path, html_text)
+    return updated, added
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
+    page, view_id, csv_path = sys.argv[1:]
+    updated, added = patch_view(page, view_id, load_table(csv_path))
+    print(f"Patched {page} ({view_id}): {updated} rows updated, {added} rows added")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Shared page template for the pitcher dashboards.
+Every dashboard uses the same stylesheet and script (dashboard_assets/)
+and differs only in its title, text and data views. Each view's data is
+split into one payload per season; pages show the newest season first
+and only parse (or fetch) older seasons when the Year filter asks for
+them. Pages are written in one of two modes:
+- 'assets': the CSS, JS and each view's data go in content-hashed files
+  under assets/, which browsers can cache across pages and weeks; data
+  is also written gzipped and pages decompress it with DecompressionStream
+- 'inline': everything is embedded in a single HTML file that works offline
+Pages with several views can also share one joined table (see
+pitcher_data.join_tables); each view then reads its own prefixed columns.
+"""
+
+import gzip
+import hashlib
+import html
+import json
+import re
+from collections import namedtuple
+from datetime import date
+from pathlib import Path
+
+from atomic_output import write_bytes_atomic, write_text_atomic
+
+ASSET_DIR = Path(__file__).parent / 'dashboard_assets'
+CSS_PATH = ASSET_DIR / 'dashboard.css'
+JS_PATH = ASSET_DIR / 'dashboard.js'
+# Files whose edits change every rendered page
+TEMPLATE_FILES = (Path(__file__), CSS_PATH, JS_PATH)
+
+MODES = ('assets', 'inline')
+DEFAULT_MODE = 'assets'
+OUTPUT_ASSET_DIR = 'assets'  # Next to the HTML pages
+HASH_LENGTH = 12
+GZIP_LEVEL = 9
+ASSET_REFERENCE = re.compile(rf'"{OUTPUT_ASSET_DIR}/([^"/]+)"')
+
+# Page title, footer and view info may use {seasons} (e.g. '2023-2025') and
+# {updated} (e.g. 'January 27, 2026'), filled in from the data at render time.
+# One table of data on a page; pages with several views get a toggle.
+# prefix picks the view's pitch columns out of a joined table, e.g. 'mix.'
+DashboardView = namedtuple('DashboardView', 'id label info avg_label avg_suffix prefix', defaults=('',))
+DashboardPage = namedtuple('DashboardPage', 'title heading footer views header_html', defaults=('',))
+
+TABLE_COLUMNS = [
+    ('player', 'Player Name'),
+    ('team', 'Team'),
+    ('year', 'Year'),
+    ('pitch_count', 'Pitch Count'),
+    ('FB', 'FB (Fastball)'),
+    ('SL', 'SL (Slider)'),
+    ('CH', 'CH (Changeup)'),
+    ('CB', 'CB (Curveball)'),
+    ('SNK', 'SNK (Sinker)'),
+    ('CUT', 'CUT (Cutter)'),
+    ('SPLT', 'SPLT (Split)'),
+    ('KN', 'KN (Knuckleball)'),
+    ('SWP', 'SWP (Sweeper)'),
+    ('SLV', 'SLV (Slurve)'),
+    ('FRK', 'FRK (Forkball)'),
+]
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+def _script_json(value):
+    """JSON that is safe inside a <script> tag."""
+    return json.dumps(value, separators=(',', ':')).replace('</', '<\\/')
+
+def asset_name(stem, suffix, text):
+    return f'{stem}.{content_hash(text)}.{suffix}'
+
+def write_asset(directory, name, data):
+    """Write bytes to directory/name unless it already exists (names are content-hashed)."""
+    path = directory / name
+    if not path.exists():
+        write_bytes_atomic(path, data)
+    return name
+
+def write_text_asset(directory, stem, suffix, text):
+    """Write text to directory/stem.<hash>.suffix; return the file name."""
+    return write_asset(directory, asset_name(stem, suffix, text), text.encode('utf-8'))
+
+def write_data_assets(directory, stem, payload):
+    """
+    Write a view's JSON payload plain and gzipped (same hash, .json and
+    .json.gz). mtime=0 keeps the gzip bytes identical between runs.
+    Returns (json name, gzip name).
+    """
+    name = asset_name(stem, 'json', payload)
+    data = payload.encode('utf-8')
+    write_asset(directory, name, data)
+    write_asset(directory, f'{name}.gz', gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+    return name, f'{name}.gz'
+
+def referenced_assets(page_dir):
+    """Names of the files under page_dir/assets that any page in page_dir links to."""
+    referenced = set()
+    for page in Path(page_dir).glob('*.html'):
+        referenced.update(ASSET_REFERENCE.findall(page.read_text(encoding='utf-8', errors='replace')))
+    return referenced
+
+def prune_assets(page_dir, keep=()):
+    """
+    Delete asset files that no page in page_dir links to, except names in
+    keep (e.g. those the previous pages used, for readers still on them).
+    Returns the deleted file names.
+    """
+    asset_dir = Path(page_dir) / OUTPUT_ASSET_DIR
+    if not asset_dir.is_dir():
+        return []
+    keep = referenced_assets(page_dir) | set(keep)
+    removed = []
+    for path in sorted(asset_dir.iterdir()):
+        if path.is_file() and path.name not in keep:
+            path.unlink()
+            removed.append(path.name)
+    return removed
+
+def season_range(tables):
+    """'2023-2025' for the seasons in tables ('2025' for one season, '' for none)."""
+    seasons = sorted({year for table in tables for year in table.seasons()})
+    if not seasons:
+        return ''
+    return str(seasons[0]) if seasons[0] == seasons[-1] else f'{seasons[0]}-{seasons[-1]}'
+
+def _fill_page_text(page, tables, updated):
+    """page with {seasons} and {updated} filled in its title, footer and view info."""
+    text = {
+        'seasons': season_range(tables),
+        'updated': f'{updated:%B} {updated.day}, {updated.year}',
+    }
+    return page._replace(
+        title=page.title.format(**text),
+        footer=page.footer.format(**text),
+        views=[view._replace(info=view.info.format(**text)) for view in page.views],
+    )
+
+def _header(page):
+    heading = f'<h1>{html.escape(page.heading)}</h1>'
+    if len(page.views) < 2:
+        return heading
+    buttons = '\n'.join(
+        f'                <button class="toggle-btn" data-view="{html.escape(view.id)}" '
+        f'onclick="switchView(\'{html.escape(view.id)}\')">{html.escape(view.label)}</button>'
+        for view in page.views
+    )
+    return f"""<div class="header-section">
+            {heading}
+            <div class="view-toggle">
+{buttons}
+            </div>
+        </div>"""
+
+def season_partitions(dataset, table):
+    """Return (data element id, year, season table) per season, newest first."""
+    return [
+        (f'data-{dataset}-{year}', year, table.season(year))
+        for year in reversed(table.seasons())
+    ]
+
+def _movers_section(view, movers, hidden):
+    """Ranked table of a view's biggest week-over-week changes ('' if none)."""
+    if not movers:
+        return ''
+    rows = '\n'.join(
+        f"""                    <tr>
+                        <td>{html.escape(mover.name)}</td>
+                        <td><span class="team">{html.escape(mover.team)}</span></td>
+                        <td>{mover.pitch}</td>
+                        <td class="number">{mover.previous:.1f}{view.avg_suffix}</td>
+                        <td class="number">{mover.current:.1f}{view.avg_suffix}</td>
+                        <td class="number change {'down' if mover.change < 0 else 'up'}">{mover.change:+.1f}{view.avg_suffix}</td>
+                    </tr>"""
+        for mover in movers
+    )
+    return f"""
+        <div class="movers" data-view="{html.escape(view.id)}"{' hidden' if hidden else ''}>
+            <h2>Biggest Movers Since Last Scrape ({movers[0].year})</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Player</th>
+                        <th>Team</th>
+                        <th>Pitch</th>
+                        <th>Previous</th>
+                        <th>Now</th>
+                        <th>Change</th>
+                    </tr>
+                </thead>
+                <tbody>
+{rows}
+                </tbody>
+            </table>
+        </div>
+"""
+
+def render_page(page, partitions, styles, scripts, data_blocks, movers=None):
+    """Return the page HTML around already-rendered style, script and data tags."""
+    config = {
+        'views': [
+            {
+                'id': view.id,
+                'seasons': [{'year': year, 'data': element_id} for element_id, year, _ in view_partitions],
+                'info': view.info,
+                'avgLabel': view.avg_label,
+                'avgSuffix': view.avg_suffix,
+                'prefix': view.prefix,
+            }
+            for view, view_partitions in zip(page.views, partitions)
+        ]
+    }
+    movers = movers or [None] * len(page.views)
+    movers_sections = ''.join(
+        _movers_section(view, view_movers, hidden=index > 0)
+        for index, (view, view_movers) in enumerate(zip(page.views, movers))
+    )
+    header_cells = '\n'.join(
+        f'                        <th class="sortable" onclick="sortTable(\'{column}\')">{label}</th>'
+        for column, label in TABLE_COLUMNS
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(page.title)}</title>
+    {styles}
+</head>
+<body>
+    <div class="container">
+        {_header(page)}{page.header_html}
+        <div class="info" id="infoText">{html.escape(page.views[0].info)}</div>
+
+        <div class="stats" id="statsContainer"></div>
+{movers_sections}
+        <div class="controls">
+            <input type="text" class="search-box" id="searchInput" placeholder="Search by player name...">
+            <select class="team-filter" id="teamFilter">
+                <option value="">All Teams</option>
+            </select>
+            <select class="team-filter" id="yearFilter">
+                <option value="">All Years</option>
+            </select>
+            <button class="btn" onclick="resetFilters()">Reset</button>
+        </div>
+
+        <div class="table-wrapper" id="tableWrapper">
+            <table id="dataTable">
+                <thead>
+                    <tr>
+{header_cells}
+                    </tr>
+                </thead>
+                <tbody id="tableBody">
+                </tbody>
+            </table>
+        </div>
+
+        <div class="footer">
+            {html.escape(page.footer)}
+        </div>
+    </div>
+
+    <script type="application/json" id="dashboardConfig">{_script_json(config)}</script>
+{data_blocks}
+    {scripts}
+</body>
+</html>"""
+
+def render_dashboard(page, tables, output_path, mode=DEFAULT_MODE, movers=None, updated=None):
+    """
+    Write the page for a DashboardPage to output_path.
+    tables holds one PitcherSeasonTable per view, in page.views order, or a
+    single joined table shared by every view; movers optionally holds one
+    list of pitch_deltas.Mover per view. updated is the date of the newest
+    scrape shown (default: today).
+    Returns output_path.
+    """
+    if mode not in MODES:
+        raise ValueError(f'Unknown dashboard mode {mode!r}; expected one of {MODES}')
+    if len(tables) not in (1, len(page.views)):
+        raise ValueError(f'{len(page.views)} views but {len(tables)} tables')
+    page = _fill_page_text(page, tables, updated or date.today())
+
+    output_path = Path(output_path)
+    css = CSS_PATH.read_text(encoding='utf-8')
+    js = JS_PATH.read_text(encoding='utf-8')
+    if len(tables) == len(page.views):
+        datasets = [(view.id, table) for view, table in zip(page.views, tables)]
+    else:
+        datasets = [('-'.join(view.id for view in page.views), tables[0])]
+    dataset_partitions = {dataset: season_partitions(dataset, table) for dataset, table in datasets}
+    payloads = [
+        (element_id, f'{dataset}-{year}', season.to_payload_json())
+        for dataset, seasons in dataset_partitions.items()
+        for element_id, year, season in seasons
+    ]
+    # With one shared dataset every view reads the same partitions
+    partitions = [
+        dataset_partitions[datasets[index if len(datasets) > 1 else 0][0]]
+        for index in range(len(page.views))
+    ]
+
+    if mode == 'inline':
+        styles = f'<style>\n{css}    </style>'
+        scripts = f'<script>\n{js}    </script>'
+        data_blocks = '\n'.join(
+            f'    <script type="application/json" id="{element_id}">{payload}</script>'
+            for element_id, _, payload in payloads
+        )
+    else:
+        asset_dir = output_path.parent / OUTPUT_ASSET_DIR
+        css_name = write_text_asset(asset_dir, 'dashboard', 'css', css)
+        js_name = write_text_asset(asset_dir, 'dashboard', 'js', js)
+        styles = f'<link rel="stylesheet" href="{OUTPUT_ASSET_DIR}/{css_name}">'
+        scripts = f'<script src="{OUTPUT_ASSET_DIR}/{js_name}"></script>'
+        blocks = []
+        for element_id, stem, payload in payloads:
+            # Named by view, season and content: pages showing the same data share
+            # one file, and finished seasons keep their name (and cache) week to week
+            data_name, gzip_name = write_data_assets(asset_dir, stem, payload)
+            blocks.append(
+                f'    <script type="application/json" id="{element_id}" '
+                f'data-src="{OUTPUT_ASSET_DIR}/{data_name}" '
+                f'data-src-gzip="{OUTPUT_ASSET_DIR}/{gzip_name}"></script>'
+            )
+        data_blocks = '\n'.join(blocks)
+
+    write_text_atomic(output_path, render_page(page, partitions, styles, scripts, data_blocks, movers))
+    return output_path
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Shared keep-alive HTTP sessions for the scrapers.
+make_session() retries GETs on 5xx answers, timeouts and dropped
+connections with exponential backoff, so callers only see the errors
+that outlast every retry.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRIES = 3  # Per request, on 5xx responses, timeouts and dropped connections
+BACKOFF_FACTOR = 0.5  # Retry waits 0.5s, 1s, 2s...
+POOL_SIZE = 10  # Keep-alive connections per host
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+def make_session(pool_size=POOL_SIZE, retries=None, backoff_factor=None):
+    """Keep-alive session that retries with backoff on 5xx and timeouts."""
+    retry = Retry(
+        total=RETRIES if retries is None else retries,
+        backoff_factor=BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+    )
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
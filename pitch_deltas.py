@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Week-over-week change detection for pitch velocity and usage.
+Lines the newest scrape up with the previous one by (player_id, year)
+and computes every pitch's change for the whole league as one NumPy
+matrix, so the cost stays flat as the warehouse history grows.
+Small samples are screened per pitch: a pitch counts only once the
+pitcher has thrown it MIN_PITCHES times (usage % x pitch count).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from pitcher_data import PITCH_TYPES
+
+MIN_PITCHES = 100  # Of the pitch itself; averages over fewer throws swing too much
+TOP_MOVERS = 20
+USAGE_LEADERBOARD = 'pitch mix'  # Its pitch columns are usage percentages
+
+Mover = namedtuple('Mover', 'name team year pitch previous current change')
+
+def _row_keys(table):
+    return table.player_id * 10000 + table.year
+
+def align_rows(current, previous):
+    """For each row of current, the row of the same (player_id, year) in previous, or -1."""
+    previous_keys = _row_keys(previous)
+    order = np.argsort(previous_keys, kind='stable')
+    sorted_keys = previous_keys[order]
+    if not len(sorted_keys):
+        return np.full(len(current), -1)
+
+    current_keys = _row_keys(current)
+    positions = np.minimum(np.searchsorted(sorted_keys, current_keys), len(sorted_keys) - 1)
+    found = (sorted_keys[positions] == current_keys) & (current.player_id > 0)
+    return np.where(found, order[positions], -1)
+
+def pitch_deltas(current, previous):
+    """
+    Return (previous, current, change) as rows x PITCH_TYPES matrices aligned
+    to current's rows. previous and change are NaN where the pitcher was not
+    in the previous scrape or either week lacks the pitch.
+    """
+    now = np.column_stack([current.pitches[code] for code in PITCH_TYPES])
+    before = np.full_like(now, np.nan)
+    match = align_rows(current, previous)
+    matched = match >= 0
+    before[matched] = np.column_stack([previous.pitches[code] for code in PITCH_TYPES])[match[matched]]
+    return before, now, now - before
+
+def pitch_counts(table, usage):
+    """
+    rows x PITCH_TYPES matrix of how often each of table's pitchers threw
+    each pitch: usage's percentage for the same (player_id, year) times its
+    pitch count. NaN where usage has no row or no percentage.
+    """
+    counts = np.full((len(table), len(PITCH_TYPES)), np.nan)
+    match = align_rows(table, usage)
+    matched = match >= 0
+    shares = np.column_stack([usage.pitches[code] for code in PITCH_TYPES])[match[matched]] / 100
+    counts[matched] = shares * usage.pitch_count[match[matched], None]
+    return counts
+
+def biggest_movers(current, previous, top=TOP_MOVERS, min_pitches=MIN_PITCHES, usage=None):
+    """
+    The top (player, pitch) changes by size, largest first, as Movers.
+    Pitches thrown fewer than min_pitches times in current's season (per
+    usage, a pitch mix table) are skipped; without usage the pitcher's
+    total pitch count is used instead.
+    """
+    before, now, change = pitch_deltas(current, previous)
+    if usage is None:
+        change[current.pitch_count < min_pitches] = np.nan
+    else:
+        change[~(pitch_counts(current, usage) >= min_pitches)] = np.nan
+
+    size = np.abs(change).ravel()
+    moved = np.flatnonzero(size > 0)  # NaN compares False, so this also drops missing values
+    ranked = moved[np.argsort(-size[moved], kind='stable')][:top]
+    rows, columns = np.divmod(ranked, len(PITCH_TYPES))
+    return [
+        Mover(
+            name=current.names[row],
+            team=current.teams[row],
+            year=int(current.year[row]),
+            pitch=PITCH_TYPES[column],
+            previous=float(before[row, column]),
+            current=float(now[row, column]),
+            change=float(change[row, column]),
+        )
+        for row, column in zip(rows.tolist(), columns.tolist())
+    ]
+
+def latest_movers(warehouse, leaderboard, top=TOP_MOVERS):
+    """
+    Biggest movers of a leaderboard's newest season between its last two
+    scrapes, screened by the same day's USAGE_LEADERBOARD snapshot.
+    """
+    seasons = warehouse.seasons(leaderboard)
+    if not seasons:
+        return []
+    year = seasons[-1]
+    dates = warehouse.scrape_dates(leaderboard, year)
+    if len(dates) < 2:
+        return []
+    current = warehouse.snapshot(leaderboard, [year], as_of=dates[-1])
+    previous = warehouse.snapshot(leaderboard, [year], as_of=dates[-2])
+    if leaderboard == USAGE_LEADERBOARD:
+        usage = current
+    else:
+        usage = warehouse.snapshot(USAGE_LEADERBOARD, [year], as_of=dates[-1])
+    return biggest_movers(current, previous, top, usage=usage if len(usage) else None)
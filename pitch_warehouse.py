@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Local history of every leaderboard scrape.
+Each weekly scrape is stored in SQLite keyed by (leaderboard, player_id,
+year, scrape_date) instead of overwriting last week's CSV, so the
+dashboards can be built from the latest snapshot and earlier weeks stay
+queryable for trends.
+"""
+
+import hashlib
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+from pitcher_data import PITCH_TYPES, PitcherSeasonTable
+
+DEFAULT_PATH = Path(__file__).parent / 'pitch_warehouse.sqlite'
+
+_PITCH_COLUMNS = ',\n    '.join(f'"{code}" REAL' for code in PITCH_TYPES)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS pitcher_seasons (
+    leaderboard TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    scrape_date TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    team TEXT NOT NULL,
+    pitch_count INTEGER NOT NULL,
+    {_PITCH_COLUMNS},
+    PRIMARY KEY (leaderboard, player_id, year, scrape_date)
+);
+CREATE INDEX IF NOT EXISTS idx_pitcher_seasons_snapshot
+    ON pitcher_seasons (leaderboard, year, scrape_date);
+CREATE TABLE IF NOT EXISTS scrapes (
+    leaderboard TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    scrape_date TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    content_hash TEXT,
+    PRIMARY KEY (leaderboard, year, scrape_date)
+);
+"""
+
+def _quoted(codes):
+    return ', '.join(f'"{code}"' for code in codes)
+
+def _content_hash(rows):
+    """SHA-256 of a season's stored rows, independent of row order and scrape date."""
+    digest = hashlib.sha256()
+    for row in sorted(rows, key=lambda row: row[1]):
+        digest.update(repr(row[1:3] + row[4:]).encode('utf-8'))
+    return digest.hexdigest()
+
+class PitchWarehouse:
+    """SQLite-backed history of PitcherSeasonTable scrapes, one snapshot per leaderboard, season and day."""
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+        columns = [name for _, name, *_ in self.conn.execute('PRAGMA table_info(scrapes)')]
+        if 'content_hash' not in columns:  # Warehouses created before content hashes
+            self.conn.execute('ALTER TABLE scrapes ADD COLUMN content_hash TEXT')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def put_table(self, leaderboard, table, scrape_date=None, scraped_at=None):
+        """
+        Store a scraped table as that day's snapshot of each season in it,
+        replacing an earlier scrape of the same seasons on the same day.
+        Rows without a player_id cannot be keyed and are skipped.
+        Returns (rows stored, rows skipped).
+        """
+        scrape_date = (scrape_date or date.today()).isoformat()
+        scraped_at = (scraped_at or datetime.now()).isoformat()
+        keyed = np.flatnonzero(table.player_id > 0)
+        pitches = [
+            np.where(np.isnan(table.pitches[code][keyed]), None, table.pitches[code][keyed]).tolist()
+            for code in PITCH_TYPES
+        ]
+        rows = [
+            (leaderboard, player_id, year, scrape_date, table.names[i], table.teams[i], pitch_count, *values)
+            for i, player_id, year, pitch_count, *values in zip(
+                keyed.tolist(),
+                table.player_id[keyed].tolist(),
+                table.year[keyed].tolist(),
+                table.pitch_count[keyed].tolist(),
+                *pitches,
+            )
+        ]
+        years = np.unique(table.year[keyed]).tolist()
+        season_rows = {year: [row for row in rows if row[2] == year] for year in years}
+
+        with self.conn:
+            self.conn.executemany(
+                'DELETE FROM pitcher_seasons WHERE leaderboard = ? AND year = ? AND scrape_date = ?',
+                [(leaderboard, year, scrape_date) for year in years],
+            )
+            self.conn.executemany(
+                f"""
+                INSERT INTO pitcher_seasons (
+                    leaderboard, player_id, year, scrape_date, player_name, team, pitch_count,
+                    {_quoted(PITCH_TYPES)})
+                VALUES ({', '.join('?' * (7 + len(PITCH_TYPES)))})
+                """,
+                rows,
+            )
+            self.conn.executemany(
+                """
+                INSERT INTO scrapes (leaderboard, year, scrape_date, scraped_at, row_count, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (leaderboard, year, scrape_date) DO UPDATE SET
+                    scraped_at = excluded.scraped_at,
+                    row_count = excluded.row_count,
+                    content_hash = excluded.content_hash
+                """,
+                [
+                    (leaderboard, year, scrape_date, scraped_at, len(season_rows[year]), _content_hash(season_rows[year]))
+                    for year in years
+                ],
+            )
+        return len(rows), len(table) - len(rows)
+
+    def seasons(self, leaderboard):
+        """Seasons with at least one stored scrape, oldest first."""
+        return [year for (year,) in self.conn.execute(
+            'SELECT DISTINCT year FROM scrapes WHERE leaderboard = ? ORDER BY year', (leaderboard,))]
+
+    def scrape_dates(self, leaderboard, year=None):
+        """Days with a stored scrape (of one season, or any), oldest first."""
+        query = 'SELECT DISTINCT scrape_date FROM scrapes WHERE leaderboard = ?'
+        params = [leaderboard]
+        if year is not None:
+            query += ' AND year = ?'
+            params.append(year)
+        return [date.fromisoformat(day) for (day,) in self.conn.execute(query + ' ORDER BY scrape_date', params)]
+
+    def last_updated(self, leaderboards):
+        """Day of the newest scrape of any of the leaderboards, or None."""
+        dates = [day for name in leaderboards for day in self.scrape_dates(name)[-1:]]
+        return max(dates, default=None)
+
+    def _latest_scrapes(self, leaderboard, seasons=None, as_of=None):
+        """(year, scrape_date, content_hash) of each season's newest scrape on or before as_of."""
+        query = """
+            SELECT year, scrape_date, COALESCE(content_hash, scraped_at) FROM scrapes AS s
+            WHERE leaderboard = ?
+              AND scrape_date = (
+                  SELECT MAX(scrape_date) FROM scrapes
+                  WHERE leaderboard = s.leaderboard AND year = s.year AND scrape_date <= ?)
+        """
+        params = [leaderboard, (as_of or date.max).isoformat()]
+        if seasons is not None:
+            seasons = list(seasons)
+            query += f" AND year IN ({', '.join('?' * len(seasons))})"
+            params += seasons
+        return self.conn.execute(query + ' ORDER BY year DESC', params).fetchall()
+
+    def version(self, leaderboard, seasons=None):
+        """
+        Digest of what snapshot() would return. It changes only when a season's
+        stored rows do, so re-scraping unchanged data keeps the same version.
+        """
+        digest = hashlib.sha256(leaderboard.encode('utf-8'))
+        for year, _, content_hash in self._latest_scrapes(leaderboard, seasons):
+            digest.update(f'{year}|{content_hash};'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def snapshot(self, leaderboard, seasons=None, as_of=None, columns=None):
+        """
+        Each season's newest scrape on or before as_of (default: newest overall)
+        as one PitcherSeasonTable, newest season first. Only the given seasons
+        and pitch columns are read; other pitch columns are left empty.
+        """
+        columns = list(columns or PITCH_TYPES)
+        unknown = set(columns) - set(PITCH_TYPES)
+        if unknown:
+            raise ValueError(f'Unknown pitch columns: {sorted(unknown)}')
+        names, teams, player_id, year, pitch_count = [], [], [], [], []
+        pitches = {code: [] for code in columns}
+        for season, scrape_date, _ in self._latest_scrapes(leaderboard, seasons, as_of):
+            rows = self.conn.execute(
+                f"""
+                SELECT player_name, team, player_id, year, pitch_count, {_quoted(columns)}
+                FROM pitcher_seasons
+                WHERE leaderboard = ? AND year = ? AND scrape_date = ?
+                ORDER BY player_name, player_id
+                """,
+                (leaderboard, season, scrape_date),
+            ).fetchall()
+            if not rows:
+                continue
+            values = list(zip(*rows))
+            names += values[0]
+            teams += values[1]
+            player_id += values[2]
+            year += values[3]
+            pitch_count += values[4]
+            for code, column in zip(columns, values[5:]):
+                pitches[code] += column
+        return PitcherSeasonTable(
+            names=names,
+            teams=teams,
+            player_id=player_id,
+            year=year,
+            pitch_count=pitch_count,
+            pitches={code: np.array(pitches[code], dtype=np.float64) for code in columns},
+        )
+
+    def history(self, leaderboard, code, seasons=None):
+        """
+        Every stored value of one pitch column, for trends across scrapes.
+        Returns (scrape_date, player_id, year, value) rows ordered by player, season and date.
+        """
+        if code not in PITCH_TYPES:
+            raise ValueError(f'Unknown pitch column {code!r}')
+        query = f"""
+            SELECT scrape_date, player_id, year, "{code}" FROM pitcher_seasons
+            WHERE leaderboard = ? AND "{code}" IS NOT NULL
+        """
+        params = [leaderboard]
+        if seasons is not None:
+            seasons = list(seasons)
+            query += f" AND year IN ({', '.join('?' * len(seasons))})"
+            params += seasons
+        return [
+            (date.fromisoformat(day), player_id, year, value)
+            for day, player_id, year, value in self.conn.execute(
+                query + ' ORDER BY player_id, year, scrape_date', params)
+        ]
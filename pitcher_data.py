@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Shared in-memory model for pitch mix and velocity data.
+PitcherSeasonTable holds one row per (player_id, year) with NumPy arrays
+for every column, so CSVs are parsed once per process and aggregates run
+over whole columns at a time.
+"""
+
+import base64
+import csv
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+
+from atomic_output import write_text_atomic
+
+# Dashboard pitch codes, in display order
+PITCH_TYPES = ['FB', 'SL', 'CH', 'CB', 'SNK', 'CUT', 'SPLT', 'KN', 'SWP', 'SLV', 'FRK']
+
+# Savant's pitch abbreviations for each dashboard code
+SAVANT_PITCH_CODES = {
+    'FB': 'ff', 'SL': 'sl', 'CH': 'ch', 'CB': 'cu', 'SNK': 'si', 'CUT': 'fc',
+    'SPLT': 'fs', 'KN': 'kn', 'SWP': 'st', 'SLV': 'sv', 'FRK': 'fo',
+}
+
+# Pitch names in the headers of Savant's rendered leaderboard table
+SAVANT_PITCH_NAMES = {
+    'FB': '4-Seam', 'SL': 'Slider', 'CH': 'Change', 'CB': 'Curveball', 'SNK': 'Sinker', 'CUT': 'Cutter',
+    'SPLT': 'Splitter', 'KN': 'Knuckle', 'SWP': 'Sweeper', 'SLV': 'Slurve', 'FRK': 'Forkball',
+}
+
+# Column order of the CSVs the dashboards read
+CSV_HEADER = ['Player Name', 'Team', 'year', 'pitch_count'] + PITCH_TYPES + ['player_id']
+
+# Header spellings seen in our CSVs and in Savant exports/tables
+HEADER_ALIASES = {
+    'name': ('Player Name', 'last_name, first_name', 'Player', 'player_name'),
+    'team': ('Team',),
+    'player_id': ('player_id',),
+    'year': ('year', 'Year'),
+    'pitch_count': ('pitch_count', 'Pitches'),
+}
+for _code, _savant in SAVANT_PITCH_CODES.items():
+    _name = SAVANT_PITCH_NAMES[_code]
+    HEADER_ALIASES[_code] = (
+        _code, f'n_{_savant}_formatted', f'{_savant}_avg_speed', f'{_name} Avg MPH', f'{_name} %',
+    )
+
+def find_column(header, field):
+    """Index of a HEADER_ALIASES field in a header row, or None."""
+    for alias in HEADER_ALIASES[field]:
+        if alias in header:
+            return header.index(alias)
+    return None
+
+def _to_float(text):
+    try:
+        return float(text.replace(',', ''))
+    except (TypeError, ValueError):
+        return np.nan
+
+def _to_int(text):
+    # Rendered tables write counts with thousands separators ('2,333')
+    try:
+        return int(float(text.replace(',', '')))
+    except (TypeError, ValueError):
+        return 0
+
+def format_number(value):
+    """Format a float the way our CSVs write it ('' for missing, no trailing .0)."""
+    if np.isnan(value):
+        return ''
+    return format(float(value), 'g')
+
+def encode_bitmap(mask):
+    """Pack a boolean row mask into a base64 bitmap (bit i of byte i // 8 is row i)."""
+    packed = np.packbits(np.asarray(mask, dtype=bool), bitorder='little')
+    return base64.b64encode(packed.tobytes()).decode('ascii')
+
+class PitcherSeasonTable:
+    """
+    Pitcher seasons keyed by (player_id, year), one typed array per column.
+    Pitch columns are PITCH_TYPES unless columns says otherwise; a joined
+    table (see join_tables) has '<leaderboard>.<code>' columns instead.
+    """
+    def __init__(self, names, teams, player_id, year, pitch_count, pitches, columns=None):
+        self.names = list(names)
+        self.teams = list(teams)
+        self.player_id = np.asarray(player_id, dtype=np.int64)
+        self.year = np.asarray(year, dtype=np.int32)
+        self.pitch_count = np.asarray(pitch_count, dtype=np.int64)
+        self.pitches = {
+            code: np.asarray(pitches.get(code, np.full(len(self.names), np.nan)), dtype=np.float64)
+            for code in (columns or PITCH_TYPES)
+        }
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_rows(cls, header, rows):
+        """Build a table from a header and rows of strings, in any known spelling."""
+        columns = {field: find_column(header, field) for field in HEADER_ALIASES}
+        if columns['name'] is None:
+            raise ValueError(f'No player name column in header: {header}')
+
+        def cells(field, convert, default):
+            index = columns[field]
+            if index is None:
+                return [default] * len(rows)
+            return [convert(row[index]) if index < len(row) else default for row in rows]
+
+        rows = [row for row in rows if row]
+        return cls(
+            names=cells('name', str.strip, ''),
+            teams=cells('team', str.strip, ''),
+            player_id=cells('player_id', _to_int, 0),
+            year=cells('year', _to_int, 0),
+            pitch_count=cells('pitch_count', _to_int, 0),
+            pitches={code: cells(code, _to_float, np.nan) for code in PITCH_TYPES},
+        )
+
+    @classmethod
+    def from_csv_text(cls, csv_content):
+        reader = csv.reader(io.StringIO(csv_content))
+        header = [h.strip() for h in next(reader, [])]
+        return cls.from_rows(header, list(reader))
+
+    @classmethod
+    def from_csv(cls, path):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = [h.strip() for h in next(reader, [])]
+            return cls.from_rows(header, list(reader))
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Rebuild a table from to_payload() output, e.g. a data block read back from a page."""
+        columns = payload['columns']
+        team_names = payload['dictionaries']['team']
+        codes = [code for code in columns if code not in ('player', 'team', 'year', 'pitch_count', 'player_id')]
+        return cls(
+            names=columns['player'],
+            teams=[team_names[code] for code in columns['team']],
+            player_id=[pid or 0 for pid in columns.get('player_id', [0] * payload['rows'])],
+            year=columns['year'],
+            pitch_count=columns['pitch_count'],
+            pitches={code: np.array(columns[code], dtype=np.float64) for code in codes},
+            columns=codes,
+        )
+
+    @classmethod
+    def concat(cls, tables):
+        """Stack tables (e.g. one per season) into one, rows in the given order."""
+        tables = list(tables)
+        columns = list(tables[0].pitches) if tables else None
+        return cls(
+            names=[name for table in tables for name in table.names],
+            teams=[team for table in tables for team in table.teams],
+            player_id=np.concatenate([table.player_id for table in tables] or [[]]),
+            year=np.concatenate([table.year for table in tables] or [[]]),
+            pitch_count=np.concatenate([table.pitch_count for table in tables] or [[]]),
+            pitches={
+                code: np.concatenate([table.pitches[code] for table in tables])
+                for code in columns or []
+            },
+            columns=columns,
+        )
+
+    def take(self, rows):
+        """Return a new table with only the given rows (indices or a boolean mask)."""
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return PitcherSeasonTable(
+            names=[self.names[i] for i in rows],
+            teams=[self.teams[i] for i in rows],
+            player_id=self.player_id[rows],
+            year=self.year[rows],
+            pitch_count=self.pitch_count[rows],
+            pitches={code: values[rows] for code, values in self.pitches.items()},
+            columns=list(self.pitches),
+        )
+
+    def seasons(self):
+        """Distinct years in the table, oldest first."""
+        return np.unique(self.year).tolist()
+
+    def season(self, year):
+        """Return the rows for one year as a new table."""
+        return self.take(self.year == year)
+
+    def league_average(self, code, weighted=False):
+        """Mean of a pitch column over pitchers who throw it, optionally pitch-count weighted."""
+        values = self.pitches[code]
+        thrown = ~np.isnan(values)
+        if not thrown.any():
+            return np.nan
+        if weighted:
+            return float(np.average(values[thrown], weights=self.pitch_count[thrown]))
+        return float(values[thrown].mean())
+
+    def percentile(self, code, q):
+        """q-th percentile of a pitch column over pitchers who throw it."""
+        values = self.pitches[code]
+        values = values[~np.isnan(values)]
+        return float(np.percentile(values, q)) if len(values) else np.nan
+
+    def percentile_ranks(self, code):
+        """
+        Each row's 0-100 percentile rank within the column (NaN where not
+        thrown). Equal values share the average of their ranks.
+        """
+        values = self.pitches[code]
+        ranks = np.full(len(values), np.nan)
+        thrown = ~np.isnan(values)
+        count = int(thrown.sum())
+        if count == 1:
+            ranks[thrown] = 100.0
+        elif count:
+            ordered = np.sort(values[thrown])
+            below = np.searchsorted(ordered, values[thrown], side='left')
+            through = np.searchsorted(ordered, values[thrown], side='right') - 1
+            ranks[thrown] = (below + through) / 2 / (count - 1) * 100
+        return ranks
+
+    def to_payload(self):
+        """
+        Columnar, typed form of the table for the dashboards' JavaScript:
+        one array per column, numbers as numbers, null for pitches not
+        thrown, and teams as codes into a sorted dictionary.
+        """
+        team_names = sorted(set(self.teams))
+        team_codes = {team: code for code, team in enumerate(team_names)}
+        columns = {
+            'player': self.names,
+            'team': [team_codes[team] for team in self.teams],
+            'year': self.year.tolist(),
+            'pitch_count': self.pitch_count.tolist(),
+        }
+        for code, values in self.pitches.items():
+            columns[code] = np.where(np.isnan(values), None, values).tolist()
+        columns['player_id'] = [pid or None for pid in self.player_id.tolist()]
+        return {
+            'rows': len(self),
+            'columns': columns,
+            'dictionaries': {'team': team_names},
+            'index': self.search_index(columns['team'], len(team_names)),
+            'sort': self.sort_index(columns['team']),
+        }
+
+    def search_index(self, team_codes, team_count):
+        """
+        Filter index for the dashboards: lower-cased distinct names with a
+        name code per row, plus a row bitmap per team code and per year.
+        Joined tables also get a bitmap per leaderboard of the rows it has.
+        """
+        search_names = sorted({name.lower() for name in self.names})
+        name_codes = {name: code for code, name in enumerate(search_names)}
+        team_codes = np.asarray(team_codes, dtype=np.int64)
+        index = {
+            'search': search_names,
+            'name_code': [name_codes[name.lower()] for name in self.names],
+            'team': [encode_bitmap(team_codes == code) for code in range(team_count)],
+            'year': {str(year): encode_bitmap(self.year == year) for year in np.unique(self.year).tolist()},
+        }
+        groups = {}
+        for column, values in self.pitches.items():
+            if '.' in column:
+                group = column.split('.', 1)[0]
+                groups[group] = groups.get(group, np.zeros(len(self), dtype=bool)) | ~np.isnan(values)
+        if groups:
+            index['present'] = {group: encode_bitmap(mask) for group, mask in groups.items()}
+        return index
+
+    def sort_index(self, team_codes):
+        """
+        Stable ascending sort permutation for every sortable column, with
+        missing values last. 'valid' is how many rows have a value, so a
+        page can sort descending by walking order[:valid] backwards (one
+        run of equal values at a time, keeping ties stable) and then
+        order[valid:]. Permutations are base64 little-endian uint16
+        (or uint32 for tables of 65536+ rows).
+        """
+        keys = {
+            'player': np.asarray(self.names),
+            'team': np.asarray(team_codes, dtype=np.int64),
+            'year': self.year,
+            'pitch_count': self.pitch_count,
+        }
+        keys.update(self.pitches)
+
+        dtype = np.dtype('<u2') if len(self) < 1 << 16 else np.dtype('<u4')
+        order, valid = {}, {}
+        for column, values in keys.items():
+            # NumPy's stable sort already puts NaN after every number
+            permutation = np.argsort(values, kind='stable')
+            order[column] = base64.b64encode(permutation.astype(dtype).tobytes()).decode('ascii')
+            if values.dtype.kind == 'f':
+                valid[column] = int(np.count_nonzero(~np.isnan(values)))
+            else:
+                valid[column] = len(values)
+        return {'dtype': dtype.name, 'order': order, 'valid': valid}
+
+    def to_payload_json(self):
+        """to_payload() as compact JSON that is safe to embed in a <script> tag."""
+        text = json.dumps(self.to_payload(), separators=(',', ':'), allow_nan=False)
+        return text.replace('</', '<\\/')
+
+    def to_rows(self):
+        """Return CSV_HEADER followed by one list of strings per row."""
+        formatted = {code: [format_number(v) for v in self.pitches[code]] for code in PITCH_TYPES}
+        rows = [list(CSV_HEADER)]
+        for i in range(len(self)):
+            player_id = int(self.player_id[i])
+            rows.append(
+                [self.names[i], self.teams[i], str(self.year[i]), str(self.pitch_count[i])]
+                + [formatted[code][i] for code in PITCH_TYPES]
+                + [str(player_id) if player_id else '']
+            )
+        return rows
+
+    def to_csv_text(self):
+        output = io.StringIO()
+        csv.writer(output, lineterminator='\n').writerows(self.to_rows())
+        return output.getvalue()
+
+    def write_csv(self, path):
+        write_text_atomic(path, self.to_csv_text())
+
+def join_tables(tables):
+    """
+    Outer-join leaderboards (name -> PitcherSeasonTable) on (player_id, year)
+    into one wide table whose pitch columns are '<name>.<code>'. Player,
+    team and pitch count are stored once, taken from the first leaderboard
+    that has the row. Rows without a player_id are never merged.
+    """
+    tables = dict(tables)
+    sources = list(tables.values())
+    if not sources:
+        return PitcherSeasonTable([], [], [], [], [], {})
+
+    # Unique negative keys keep rows without a player_id apart
+    keys, offset = [], 0
+    for table in sources:
+        table_keys = table.player_id * 10000 + table.year
+        keys.append(np.where(table.player_id > 0, table_keys, -(offset + np.arange(len(table)) + 1)))
+        offset += len(table)
+    all_keys = np.concatenate(keys)
+    joined_keys, first = np.unique(all_keys, return_index=True)
+
+    names = [name for table in sources for name in table.names]
+    teams = [team for table in sources for team in table.teams]
+    pitches, columns = {}, []
+    for (leaderboard, table), table_keys in zip(tables.items(), keys):
+        rows = np.searchsorted(joined_keys, table_keys)
+        for code, values in table.pitches.items():
+            column = np.full(len(joined_keys), np.nan)
+            column[rows] = values
+            pitches[f'{leaderboard}.{code}'] = column
+            columns.append(f'{leaderboard}.{code}')
+
+    return PitcherSeasonTable(
+        names=[names[i] for i in first],
+        teams=[teams[i] for i in first],
+        player_id=np.concatenate([table.player_id for table in sources])[first],
+        year=np.concatenate([table.year for table in sources])[first],
+        pitch_count=np.concatenate([table.pitch_count for table in sources])[first],
+        pitches=pitches,
+        columns=columns,
+    )
+
+# Tables already loaded in this process, by path
+_loaded = {}
+
+def load_table(path):
+    """Load a CSV into a PitcherSeasonTable once per process (reloaded if the file changes)."""
+    path = Path(path).resolve()
+    mtime = path.stat().st_mtime
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, PitcherSeasonTable.from_csv(path))
+        _loaded[path] = cached
+    return cached[1]
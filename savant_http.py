@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Browser-free Savant leaderboard fetcher.
+Requests the leaderboard's CSV export (the page URL plus csv=true)
+and streams it straight into rows, so no Chrome is needed.
+Pass a session from http_retry.make_session() to retry 5xx answers and
+dropped connections before the caller falls back to the browser.
+"""
+
+import csv
+import io
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from http_retry import HEADERS
+
+def csv_export_url(url):
+    """Turn a leaderboard page URL into its CSV export URL."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'csv']
+    query.append(('csv', 'true'))
+    return urlunsplit(parts._replace(query=urlencode(query, safe=',')))
+
+def iter_leaderboard_rows(url, session=None, timeout=30):
+    """
+    Yield the leaderboard's rows (header first) as lists of strings.
+    Raises requests.HTTPError on a bad status and ValueError if the
+    server answers with a web page instead of CSV.
+    """
+    http = session or requests
+    with http.get(csv_export_url(url), headers=HEADERS, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', '')
+        if 'html' in content_type:
+            raise ValueError(f'Expected CSV export, got {content_type}')
+
+        # Savant prefixes the export with a byte-order mark
+        response.encoding = 'utf-8-sig'
+        lines = response.iter_lines(decode_unicode=True)
+        for row in csv.reader(lines):
+            if row:
+                yield row
+
+def fetch_leaderboard_csv(url, session=None, timeout=30):
+    """Fetch a leaderboard's CSV export and return it as CSV content."""
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    rows = 0
+    for row in iter_leaderboard_rows(url, session, timeout):
+        writer.writerow(row)
+        rows += 1
+    if rows < 2:
+        raise ValueError('CSV export had no data rows')
+    return output.getvalue()
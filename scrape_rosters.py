@@ -5,14 +5,19 @@ Match players against CSV and assign teams.
 Mark unmatched players as 'Free Agent'.
 """
 import csv
-import requests
 from bs4 import BeautifulSoup
-import time
 import re
+from http_retry import make_session
+from scrape_scheduler import HostRateLimiter, run_scrapes
+from team_cache import TeamCache
 
 INPUT_CSV = 'stats (51).csv'
 OUTPUT_CSV = 'stats_with_teams_final.csv'
 
+# Roster fetching
+MAX_WORKERS = 10  # Concurrent roster page downloads
+MIN_INTERVAL = 0.05  # Seconds between request starts to mlb.com
+
 # Team URLs and their abbreviations
 TEAM_ROSTERS = {
     'ARI': 'https://www.mlb.com/dbacks/roster',
@@ -54,46 +59,69 @@ def extract_player_id_from_url(url):
         return int(match.group(1))
     return None
 
-def scrape_team_roster(team_abbr, url):
+def scrape_team_roster(team_abbr, url, session=None):
     """
     Scrape a team's roster page and extract player IDs.
-    Returns dict mapping player_id -> team_abbr
+    Returns dict mapping player_id -> team_abbr. Raises requests.HTTPError
+    (or the connection error) once the session's retries are used up.
     """
     player_to_team = {}
+    http = session or make_session(pool_size=1)
     
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for player links in the page
-            # MLB.com uses links like /player/{id}
-            player_links = soup.find_all('a', href=re.compile(r'/player/\d+'))
-            
-            found_count = 0
-            for link in player_links:
-                player_id = extract_player_id_from_url(link.get('href', ''))
-                if player_id:
-                    player_to_team[player_id] = team_abbr
-                    found_count += 1
-            
-            if found_count > 0:
-                print(f"  {team_abbr}: Found {found_count} players")
-            else:
-                print(f"  {team_abbr}: No players found (may need manual review)")
-            
-            return player_to_team
+    response = http.get(url, timeout=15)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.content, 'html.parser')
+    
+    # Look for player links in the page
+    # MLB.com uses links like /player/{id}
+    player_links = soup.find_all('a', href=re.compile(r'/player/\d+'))
+    
+    found_count = 0
+    for link in player_links:
+        player_id = extract_player_id_from_url(link.get('href', ''))
+        if player_id:
+            player_to_team[player_id] = team_abbr
+            found_count += 1
+    
+    if found_count > 0:
+        print(f"  {team_abbr}: Found {found_count} players")
+    else:
+        print(f"  {team_abbr}: No players found (may need manual review)")
+    
+    return player_to_team
+
+def fetch_all_rosters(max_workers=MAX_WORKERS):
+    """
+    Fetch every team roster concurrently over one keep-alive session.
+    Returns dict mapping player_id -> team_abbr; teams whose page failed
+    are reported and left out.
+    """
+    teams = {url: team_abbr for team_abbr, url in TEAM_ROSTERS.items()}
+    jobs = list(TEAM_ROSTERS.items())
+    
+    with make_session(max_workers) as session:
+        results = run_scrapes(
+            jobs,
+            lambda url: scrape_team_roster(teams[url], url, session),
+            max_workers=max_workers,
+            rate_limiter=HostRateLimiter(MIN_INTERVAL),
+        )
+    
+    all_player_teams = {}
+    failed = []
+    for team_abbr, _ in jobs:
+        result = results[team_abbr]
+        if result.error:
+            print(f"  {team_abbr}: Error - {result.error}")
+            failed.append(team_abbr)
         else:
-            print(f"  {team_abbr}: HTTP {response.status_code}")
-            return {}
+            all_player_teams.update(result.value)
+    if failed:
+        print(f"Failed rosters ({len(failed)}): {', '.join(failed)}")
     
-    except Exception as e:
-        print(f"  {team_abbr}: Error - {e}")
-        return {}
+    slowest = max(results.values(), key=lambda r: r.seconds)
+    print(f"Slowest roster: {slowest.name} ({slowest.seconds:.1f}s)")
+    return all_player_teams
 
 def main():
     print("Reading CSV...")
@@ -111,13 +139,11 @@ def main():
     
     # Scrape all team rosters
     print("Scraping MLB.com team rosters...")
-    all_player_teams = {}
+    all_player_teams = fetch_all_rosters()
     
-    for idx, (team_abbr, url) in enumerate(TEAM_ROSTERS.items(), 1):
-        print(f"[{idx}/30] Fetching {team_abbr}...")
-        team_players = scrape_team_roster(team_abbr, url)
-        all_player_teams.update(team_players)
-        time.sleep(0.3)  # Rate limiting
+    # Roster pages count as a fresh verification of each player's team
+    with TeamCache() as cache:
+        cache.put_many((player_id, team, 'roster') for player_id, team in all_player_teams.items())
     
     print(f"\nTotal players found across all teams: {len(all_player_teams)}\n")
     
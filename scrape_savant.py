@@ -6,8 +6,8 @@ Filter for pitchers with data prior to 2024 (2023 or earlier) AND 2024/2025.
 import requests
 from bs4 import BeautifulSoup
 import json
-import time
 from collections import defaultdict
+from scrape_scheduler import HostRateLimiter, run_scrapes
 
 # URLs to scrape
 URLS = [
@@ -73,13 +73,15 @@ def scrape_savant_table(url, source_name):
 def main():
     print("Starting Baseball Savant scraping...\n")
     
-    # Scrape both URLs
-    data_sets = []
-    for idx, url in enumerate(URLS, 1):
-        source_name = f"Leaderboard {idx}"
-        data = scrape_savant_table(url, source_name)
-        data_sets.append(data)
-        time.sleep(2)  # Rate limiting
+    # Scrape all URLs concurrently, spacing out requests to Savant
+    jobs = [(f"Leaderboard {idx}", url) for idx, url in enumerate(URLS, 1)]
+    sources = {url: name for name, url in jobs}
+    results = run_scrapes(
+        jobs,
+        lambda url: scrape_savant_table(url, sources[url]),
+        rate_limiter=HostRateLimiter(min_interval=2.0),
+    )
+    data_sets = [results[name].value or {} for name, _ in jobs]
     
     print(f"\nTotal players scraped: {len(data_sets[0])} + {len(data_sets[1])}")
     
@@ -11,13 +11,11 @@ Usage:
     python scrape_savant_selenium.py
 """
 from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from browser_session import wait_for_table_ready
+from table_csv import iter_table_rows
 import html
-import time
 
 URL = "https://baseballsavant.mlb.com/leaderboard/custom?year=2025%2C2024%2C2023&type=pitcher&filter=&min=10&selections=pitch_count%2Cff_avg_speed%2Csl_avg_speed%2Cch_avg_speed%2Ccu_avg_speed%2Csi_avg_speed%2Cfc_avg_speed%2Cfs_avg_speed%2Ckn_avg_speed%2Cst_avg_speed%2Csv_avg_speed%2Cfo_avg_speed&chart=false&x=ff_avg_speed&y=ff_avg_speed&r=no&chartType=beeswarm&sort=player_name&sortDir=asc"
 
@@ -37,12 +35,8 @@ def main():
     try:
         driver.get(URL)
 
-        # wait for a <table> to appear (the leaderboard table)
-        wait = WebDriverWait(driver, 30)
-        table = wait.until(EC.presence_of_element_located((By.TAG_NAME, 'table')))
-
-        # give some extra time for JS-rendered content inside the table
-        time.sleep(1)
+        # wait for the leaderboard table to appear and stop growing
+        table, _, _ = wait_for_table_ready(driver, timeout=30)
 
         # extract outerHTML of the table
         table_html = driver.execute_script('return arguments[0].outerHTML;', table)
@@ -58,14 +52,8 @@ def main():
             f.write(table_html)
             f.write('\n</body>\n</html>')
 
-        # parse rows and headers via selenium elements for robust column extraction
-        headers = [th.text for th in table.find_elements(By.TAG_NAME, 'th')]
-        rows = []
-        for tr in table.find_elements(By.TAG_NAME, 'tr'):
-            cells = tr.find_elements(By.TAG_NAME, 'td')
-            if not cells:
-                continue
-            rows.append([c.text for c in cells])
+        # parse headers and all cell text out of the same markup
+        headers, *rows = iter_table_rows(table_html)
 
         # filter for Andrew Abbott (both name parts present)
         abbott_rows = [r for r in rows if any('Abbott' in cell for cell in r) and any('Andrew' in cell for cell in r)]
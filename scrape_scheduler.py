@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Concurrent leaderboard scraping.
+- Runs scrape jobs on a bounded thread pool
+- Spaces out requests per host instead of fixed sleeps
+- Records how long each job took
+"""
+
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+MAX_WORKERS = 3
+MIN_INTERVAL = 1.0  # Seconds between request starts on the same host
+
+ScrapeResult = namedtuple('ScrapeResult', ['name', 'url', 'value', 'error', 'seconds'])
+
+class HostRateLimiter:
+    """Hands out request slots at least min_interval apart per host."""
+    def __init__(self, min_interval=MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+    
+    def wait(self, url):
+        """Block until the host of url may be requested again."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+def run_scrapes(jobs, fetch, max_workers=MAX_WORKERS, rate_limiter=None):
+    """
+    Run fetch(url) for every (name, url) in jobs, at most max_workers at once.
+    Returns a dict of name -> ScrapeResult in job order. Exceptions are kept
+    on the result rather than raised so one bad page doesn't sink the rest.
+    """
+    jobs = list(jobs)
+    if rate_limiter is None:
+        rate_limiter = HostRateLimiter()
+    
+    def run(name, url):
+        rate_limiter.wait(url)
+        start = time.perf_counter()
+        try:
+            value, error = fetch(url), None
+        except Exception as e:
+            value, error = None, e
+        seconds = time.perf_counter() - start
+        status = 'failed' if error else 'done'
+        print(f"  {name}: {status} in {seconds:.1f}s")
+        return ScrapeResult(name, url, value, error, seconds)
+    
+    workers = max(1, min(max_workers, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run, name, url) for name, url in jobs]
+        return {result.name: result for result in (f.result() for f in futures)}
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML table to CSV conversion.
+Rows are emitted as soon as their </tr> is read, so large leaderboards
+never get built into a full document tree, and every row is written
+through csv.writer so quoting is always correct. The browser scrape
+fetches a table's outerHTML in one call and converts it here.
+"""
+
+import csv
+import io
+import re
+from html.parser import HTMLParser
+
+# Player pages end in the MLBAM ID, e.g. /savant-player/andrew-abbott-671096
+PLAYER_LINK_ID = re.compile(r'(\d{5,})/?(?:[?#]|$)')
+
+class TableRowParser(HTMLParser):
+    """
+    Event-driven parser that collects finished <tr> rows as
+    (cell texts, is header row, player_id from the row's player link or '').
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.completed = []
+        self._row = None
+        self._cell = None
+        self._header = True
+        self._player_id = ''
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self._finish_row()
+            self._row = []
+            self._header = True
+            self._player_id = ''
+        elif tag in ('td', 'th') and self._row is not None:
+            self._finish_cell()
+            self._cell = []
+            self._header = self._header and tag == 'th'
+        elif tag == 'a' and self._row is not None and not self._player_id:
+            href = dict(attrs).get('href') or ''
+            match = PLAYER_LINK_ID.search(href) if 'player' in href else None
+            if match:
+                self._player_id = match[1]
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th'):
+            self._finish_cell()
+        elif tag in ('tr', 'thead', 'tbody', 'tfoot', 'table'):
+            self._finish_row()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            # Same as BeautifulSoup's get_text(strip=True)
+            self._cell.append(data.strip())
+
+    def _finish_cell(self):
+        if self._cell is not None:
+            self._row.append(''.join(self._cell))
+            self._cell = None
+
+    def _finish_row(self):
+        self._finish_cell()
+        if self._row:
+            self.completed.append((self._row, self._header, self._player_id))
+        self._row = None
+
+def iter_table_rows(markup, player_ids=False):
+    """
+    Yield each table row as a list of cell strings.
+    markup is either one string or an iterable of string chunks. With
+    player_ids=True a player_id column is appended: the header row gets
+    'player_id', data rows the ID from their player link ('' if none).
+    """
+    if isinstance(markup, str):
+        markup = [markup]
+
+    def rows(completed):
+        for row, header, player_id in completed:
+            if player_ids:
+                row = row + ['player_id' if header else player_id]
+            yield row
+
+    parser = TableRowParser()
+    for chunk in markup:
+        parser.feed(chunk)
+        yield from rows(parser.completed)
+        parser.completed.clear()
+    parser.close()
+    parser._finish_row()
+    yield from rows(parser.completed)
+
+def write_table_csv(markup, output, player_ids=False):
+    """Write table rows to a text stream as CSV. Returns the number of rows."""
+    writer = csv.writer(output, lineterminator='\n')
+    count = 0
+    for row in iter_table_rows(markup, player_ids):
+        writer.writerow(row)
+        count += 1
+    return count
+
+def html_table_to_csv(table_html, player_ids=False):
+    """Convert HTML table markup to CSV content."""
+    output = io.StringIO()
+    write_table_csv(table_html, output, player_ids)
+    return output.getvalue()
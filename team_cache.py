@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Persistent player -> team cache.
+Stores each player's team with where it came from (api, roster or manual)
+and when it was last verified, so weekly runs only re-resolve players that
+are missing or older than the TTL. Players the lookup found without a team
+are stored as FREE_AGENT, so they are not looked up again every run.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_PATH = Path(__file__).parent / 'team_cache.sqlite'
+TTL_DAYS = 7  # Re-verify a player's team after this long
+FREE_AGENT = 'Free Agent'  # Team of a player verified to have none
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_teams (
+    player_id INTEGER PRIMARY KEY,
+    player_name TEXT,
+    team TEXT NOT NULL,
+    source TEXT NOT NULL,
+    verified_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_player_teams_verified ON player_teams (verified_at);
+"""
+
+class TeamCache:
+    """SQLite-backed player_id -> team mapping with per-entry timestamps."""
+    def __init__(self, path=DEFAULT_PATH, ttl_days=TTL_DAYS):
+        self.path = Path(path)
+        self.ttl = timedelta(days=ttl_days)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, player_id):
+        """Return the cached team for a player, or None."""
+        row = self.conn.execute(
+            'SELECT team FROM player_teams WHERE player_id = ?', (player_id,)).fetchone()
+        return row[0] if row else None
+
+    def team_map(self):
+        """Return every cached player_id -> team."""
+        return dict(self.conn.execute('SELECT player_id, team FROM player_teams'))
+
+    def entries(self):
+        """Return every cached player_id -> (team, source)."""
+        return {
+            player_id: (team, source)
+            for player_id, team, source in self.conn.execute(
+                'SELECT player_id, team, source FROM player_teams')
+        }
+
+    def name_map(self):
+        """Return display name -> team for entries that have a name."""
+        return dict(self.conn.execute(
+            'SELECT player_name, team FROM player_teams WHERE player_name IS NOT NULL'))
+
+    def stale_ids(self, player_ids, now=None):
+        """Return the given player IDs that are missing or past the TTL."""
+        now = now or datetime.now()
+        cutoff = (now - self.ttl).isoformat()
+        fresh = {
+            player_id for (player_id,) in self.conn.execute(
+                'SELECT player_id FROM player_teams WHERE verified_at >= ?', (cutoff,))
+        }
+        return sorted(set(player_ids) - fresh)
+
+    def put_many(self, entries, verified_at=None):
+        """
+        Upsert (player_id, team, source[, player_name]) entries.
+        A missing name keeps whatever name is already cached.
+        """
+        verified_at = (verified_at or datetime.now()).isoformat()
+        rows = []
+        for entry in entries:
+            player_id, team, source = entry[:3]
+            name = entry[3] if len(entry) > 3 else None
+            rows.append((player_id, name, team, source, verified_at))
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO player_teams (player_id, player_name, team, source, verified_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (player_id) DO UPDATE SET
+                    player_name = COALESCE(excluded.player_name, player_teams.player_name),
+                    team = excluded.team,
+                    source = excluded.source,
+                    verified_at = excluded.verified_at
+                """,
+                rows,
+            )
+        return len(rows)
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+# The project is a folder of flat scripts; make them importable from tests/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+
+from pitcher_data import PitcherSeasonTable
+
+# Pitchers the test tables are built from: name -> (team, player_id)
+PITCHERS = {
+    'Abbott, Andrew': ('CIN', 671096),
+    'Cole, Gerrit': ('NYY', 543037),
+    'Skenes, Paul': ('PIT', 694973),
+}
+# (name, year, pitch_count) rows of the default table
+ROWS = (('Abbott, Andrew', 2025, 2677), ('Cole, Gerrit', 2025, 1500))
+
+@pytest.fixture
+def make_table():
+    """
+    Factory for small PitcherSeasonTables: make_table(pitches, rows=ROWS,
+    pitch_count=None), with one pitches value per row and pitch_count
+    overriding the rows' counts.
+    """
+    def make(pitches, rows=ROWS, pitch_count=None):
+        names, years, counts = zip(*rows)
+        return PitcherSeasonTable(
+            names=list(names),
+            teams=[PITCHERS[name][0] for name in names],
+            player_id=[PITCHERS[name][1] for name in names],
+            year=list(years),
+            pitch_count=list(pitch_count if pitch_count is not None else counts),
+            pitches=pitches,
+        )
+    return make
@@ -0,0 +1,95 @@
+import json
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import assign_teams
+import http_retry
+from assign_teams import KNOWN_PLAYERS, refresh_teams, resolve_teams, team_from_person
+from team_cache import FREE_AGENT, TeamCache
+
+class StatsApiStandIn(BaseHTTPRequestHandler):
+    """Answers /people?personIds= from the server's people dict; failing IDs get a 500."""
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        ids = [int(player_id) for player_id in query['personIds'][0].split(',')]
+        self.server.requests.append(ids)
+        if set(ids) & self.server.failing:
+            self.send_response(500)
+            self.end_headers()
+            return
+        people = [self.server.people[player_id] for player_id in ids if player_id in self.server.people]
+        body = json.dumps({'people': people}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stats_api(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StatsApiStandIn)
+    server.requests, server.failing = [], set()
+    server.people = {
+        671096: {'id': 671096, 'currentTeam': {'abbreviation': 'CIN'}},
+        543037: {'id': 543037, 'stats': [{'stat': {'team': {'abbreviation': 'NYY'}}}]},
+        434378: {'id': 434378},  # Retired: listed, but without a team
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(assign_teams, 'API_PEOPLE_URL', f'http://127.0.0.1:{server.server_port}/api/v1/people')
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_players_without_a_team_are_cached_as_free_agents(stats_api, monkeypatch, tmp_path):
+    monkeypatch.setattr(http_retry, 'BACKOFF_FACTOR', 0)
+    stats_api.failing = {999999}
+    players = {671096: 'Abbott, Andrew', 543037: 'Cole, Gerrit', 434378: 'Verlander, Justin', 999999: 'Unknown, Pitcher'}
+    with TeamCache(tmp_path / 'teams.sqlite') as cache:
+        refresh_teams(cache, players, batch_size=3)
+        assert cache.entries() == {
+            671096: ('CIN', 'api'),
+            543037: ('NYY', 'api'),
+            434378: (FREE_AGENT, 'api'),
+        }
+        # Only the player whose batch errored is looked up again
+        stats_api.requests.clear()
+        assert refresh_teams(cache, players, batch_size=3) == 1
+        assert stats_api.requests[0] == [999999]
+
+def test_team_from_person_prefers_the_current_team():
+    assert team_from_person({'currentTeam': {'abbreviation': 'CIN'}, 'stats': [
+        {'stat': {'team': {'abbreviation': 'NYY'}}}]}) == 'CIN'
+    assert team_from_person({'currentTeam': {}, 'stats': [
+        {'stat': {}}, {'stat': {'team': {'abbreviation': 'NYY'}}}]}) == 'NYY'
+    assert team_from_person({'id': 434378}) == ''
+
+def test_resolve_teams_batches_ids_and_merges_known_players(stats_api):
+    # 663623 is only in KNOWN_PLAYERS; 650644 is in both, and the API wins
+    assert KNOWN_PLAYERS[663623] == 'ATL' and KNOWN_PLAYERS[650644] == 'CLE'
+    stats_api.people[650644] = {'id': 650644, 'currentTeam': {'abbreviation': 'LAA'}}
+
+    resolved = resolve_teams([671096, 543037, 434378, 663623, 650644, 671096], batch_size=2)
+    assert sorted(stats_api.requests) == [[434378, 543037], [650644, 663623], [671096]]
+    assert resolved == {
+        671096: ('CIN', 'api'),
+        543037: ('NYY', 'api'),
+        434378: (FREE_AGENT, 'api'),
+        663623: ('ATL', 'manual'),
+        650644: ('LAA', 'api'),
+    }
+
+def test_resolver_does_not_load_the_roster_scraper():
+    code = 'import sys, assign_teams; print("scrape_rosters" in sys.modules, "bs4" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], cwd=str(Path(assign_teams.__file__).parent),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ['False', 'False']
@@ -0,0 +1,36 @@
+import os
+import stat
+
+import pytest
+
+from atomic_output import OutputGeneration, write_text_atomic
+
+def mode(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+@pytest.mark.skipif(os.name != 'posix', reason='POSIX file modes')
+def test_new_files_get_umask_mode_and_existing_files_keep_theirs(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+    page = tmp_path / 'index.html'
+    write_text_atomic(page, 'first')
+    assert mode(page) == 0o666 & ~umask
+
+    page.chmod(0o640)
+    write_text_atomic(page, 'second')
+    assert mode(page) == 0o640 and page.read_text() == 'second'
+
+def test_generation_publishes_only_on_success(tmp_path):
+    write_text_atomic(tmp_path / 'index.html', 'old')
+    with pytest.raises(RuntimeError):
+        with OutputGeneration(tmp_path) as generation:
+            write_text_atomic(generation.path(tmp_path / 'index.html'), 'new')
+            raise RuntimeError('build failed')
+    assert (tmp_path / 'index.html').read_text() == 'old'
+
+    with OutputGeneration(tmp_path) as generation:
+        write_text_atomic(generation.path(tmp_path / 'index.html'), 'new')
+        write_text_atomic(generation.path(tmp_path / 'assets' / 'data.json'), '{}')
+        assert [str(path) for path in generation.staged_files()] == [os.path.join('assets', 'data.json'), 'index.html']
+    assert (tmp_path / 'index.html').read_text() == 'new'
+    assert sorted(os.listdir(tmp_path)) == ['assets', 'index.html']
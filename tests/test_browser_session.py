@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip('selenium')
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+from browser_session import wait_for_table_ready
+
+class RerenderingDriver:
+    """Fake driver whose table goes stale on every count and is sometimes missing."""
+    def __init__(self, settle_after=None):
+        self.counts = 0
+        self.lookups = 0
+        self.settle_after = settle_after
+
+    def find_element(self, by, value):
+        self.lookups += 1
+        if self.lookups % 2 == 0:
+            raise NoSuchElementException('table gone between renders')
+        return object()
+
+    def find_elements(self, by, value):
+        return []
+
+    def execute_script(self, script, table):
+        self.counts += 1
+        if self.settle_after is None or self.counts <= self.settle_after:
+            raise StaleElementReferenceException('re-rendered')
+        return 50
+
+def test_constantly_rerendering_table_times_out():
+    driver = RerenderingDriver()
+    with pytest.raises(TimeoutException):
+        wait_for_table_ready(driver, timeout=0.2, stable_for=0.05, poll=0.01)
+    # Polls were spaced out instead of spinning
+    assert driver.counts < 40
+
+def test_table_that_settles_is_returned():
+    driver = RerenderingDriver(settle_after=3)
+    _, _, count = wait_for_table_ready(driver, timeout=2, stable_for=0.05, poll=0.01)
+    assert count == 50
@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+
+import build_combined_dashboard
+from dashboard_patch import _read_block, find_data_blocks, patch_view
+from pitcher_data import PitcherSeasonTable
+
+SEASONS = (('Abbott, Andrew', 2024, 2333), ('Abbott, Andrew', 2025, 2677), ('Cole, Gerrit', 2025, 1500))
+
+def season_blocks(page):
+    """year -> (data block, season table) for the page's mix view."""
+    html_text = page.read_text(encoding='utf-8')
+    blocks = find_data_blocks(html_text)
+    view = next(view for view in json.loads(blocks['dashboardConfig'].body)['views'] if view['id'] == 'mix')
+    return {
+        season['year']: (
+            blocks[season['data']],
+            PitcherSeasonTable.from_payload(_read_block(page.parent, blocks[season['data']])),
+        )
+        for season in view['seasons']
+    }
+
+def test_patch_rewrites_only_the_seasons_it_touches(tmp_path, make_table):
+    page = tmp_path / 'index.html'
+    mix, velocity = make_table({'FB': [41.0, 38.5, 55.0]}, SEASONS), make_table({'FB': [92.8, 93.0, 96.1]}, SEASONS)
+    build_combined_dashboard.build(mix, velocity, page)
+    before = season_blocks(page)
+
+    updates = make_table({'FB': [40.2, 45.0]}, (('Abbott, Andrew', 2025, 2700), ('Skenes, Paul', 2025, 1800)))
+    assert patch_view(page, 'mix', updates) == (1, 1)
+
+    after = season_blocks(page)
+    # 2024 keeps its data file; 2025 points at a new one
+    assert after[2024][0].attrs == before[2024][0].attrs
+    assert after[2025][0].attrs != before[2025][0].attrs
+
+    season = after[2025][1]
+    rows = dict(zip(season.player_id.tolist(), range(len(season))))
+    assert season.pitches['mix.FB'][rows[671096]] == 40.2
+    assert season.pitch_count[rows[671096]] == 2700
+    # The velocity columns of the joined dataset are left alone
+    assert season.pitches['velocity.FB'][rows[671096]] == 93.0
+    assert season.pitches['mix.FB'][rows[543037]] == 55.0
+    assert season.names[rows[694973]] == 'Skenes, Paul'
+    assert season.pitches['mix.FB'][rows[694973]] == 45.0 and np.isnan(season.pitches['velocity.FB'][rows[694973]])
+
+def test_patch_inline_page(tmp_path, make_table):
+    page = tmp_path / 'index.html'
+    mix, velocity = make_table({'FB': [41.0, 38.5, 55.0]}, SEASONS), make_table({'FB': [92.8, 93.0, 96.1]}, SEASONS)
+    build_combined_dashboard.build(mix, velocity, page, mode='inline')
+    updates = make_table({'FB': [41.0, 38.5, 57.5]}, SEASONS).season(2025)
+    assert patch_view(page, 'mix', updates) == (2, 0)
+    season = season_blocks(page)[2025][1]
+    assert sorted(season.pitches['mix.FB'].tolist()) == [38.5, 57.5]
+    assert not (tmp_path / 'assets').exists()
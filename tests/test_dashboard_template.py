@@ -0,0 +1,116 @@
+import base64
+import json
+import shutil
+import subprocess
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import build_dashboard
+import dashboard_template
+from dashboard_template import OUTPUT_ASSET_DIR, prune_assets, referenced_assets, season_partitions
+from pitcher_data import PitcherSeasonTable
+
+# Abbott's two seasons; the tests vary his 2025 fastball
+ABBOTT_SEASONS = (('Abbott, Andrew', 2024, 2333), ('Abbott, Andrew', 2025, 2677))
+
+def test_prune_keeps_current_and_previous_generation_assets(tmp_path, make_table):
+    page = tmp_path / 'pitcher_dashboard.html'
+    assets = tmp_path / OUTPUT_ASSET_DIR
+    build_dashboard.build(make_table({'FB': [92.8, 92.8]}, ABBOTT_SEASONS), page)
+    first = referenced_assets(tmp_path)
+    assert first == {path.name for path in assets.iterdir()}
+
+    build_dashboard.build(make_table({'FB': [92.8, 93.0]}, ABBOTT_SEASONS), page)
+    second = referenced_assets(tmp_path)
+    assert prune_assets(tmp_path, keep=first) == []
+
+    # A third build retires the first generation's 2025 data files
+    build_dashboard.build(make_table({'FB': [92.8, 93.4]}, ABBOTT_SEASONS), page)
+    removed = prune_assets(tmp_path, keep=second)
+    assert len(removed) == 2 and all(name.startswith('velocity-2025.') for name in removed)
+    assert {path.name for path in assets.iterdir()} == referenced_assets(tmp_path) | second
+
+def test_page_text_comes_from_the_data(tmp_path, make_table):
+    page = tmp_path / 'pitcher_dashboard.html'
+    table = make_table({'FB': [92.8, 93.0]}, ABBOTT_SEASONS)
+    build_dashboard.build(table, page, mode='inline', updated=date(2026, 1, 27))
+    html = page.read_text(encoding='utf-8')
+    assert '<title>MLB Pitcher Stats 2024-2025</title>' in html
+    assert '2024-2025 Pitch Velocity Data' in html
+    assert 'Updated January 27, 2026' in html
+    assert '{seasons}' not in html and '{updated}' not in html and '2023' not in html
+
+# Loads dashboard.js into a bare context, runs a snippet with the JSON input
+# bound to `input` and prints whatever the snippet assigns to `output`
+DASHBOARD_JS_RUNNER = """
+const fs = require('fs');
+const vm = require('vm');
+const [script, inputPath, snippet] = process.argv.slice(1);
+const context = { window: { addEventListener() {} }, atob, input: JSON.parse(fs.readFileSync(inputPath, 'utf8')) };
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(script, 'utf8') + '\\n' + snippet, context);
+console.log(JSON.stringify(context.output));
+"""
+
+def run_dashboard_js(tmp_path, snippet, value):
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip('node is not installed')
+    input_path = tmp_path / 'input.json'
+    input_path.write_text(json.dumps(value))
+    result = subprocess.run([node, '-e', DASHBOARD_JS_RUNNER, str(dashboard_template.JS_PATH), str(input_path), snippet],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+def test_merged_seasons_match_one_payload_over_all_seasons(tmp_path):
+    table = PitcherSeasonTable(
+        names=['Abbott, Andrew', 'Cole, Gerrit', 'Abbott, Andrew', 'Burnes, Corbin', 'Cole, Gerrit', 'Abbott, Andrew'],
+        teams=['CIN', 'NYY', 'CIN', 'BAL', 'NYY', 'CIN'],
+        player_id=[671096, 543037, 671096, 669203, 543037, 671096],
+        year=[2023, 2023, 2024, 2024, 2025, 2025],
+        pitch_count=[1500, 2900, 2333, 2900, 1500, 2677],
+        pitches={'FB': [92.5, 97.0, 92.8, np.nan, 97.0, 93.0], 'SL': [np.nan, 88.1, 85.0, 88.1, np.nan, 85.9]},
+    )
+    # The page merges seasons in its view order, newest first
+    seasons = [season for _, _, season in season_partitions('velocity', table)]
+    merged = run_dashboard_js(tmp_path, """
+        const merged = mergeSeasons(input.map(hydrate));
+        const orders = {};
+        Object.keys(merged.sortOrders).forEach(column => { orders[column] = Array.from(merged.sortOrders[column]); });
+        output = { columns: merged.columns, teamNames: merged.teamNames, orders, valid: merged.sort.valid };
+    """, [season.to_payload() for season in seasons])
+
+    expected = PitcherSeasonTable.concat(seasons).to_payload()
+    assert merged['columns'] == expected['columns']
+    assert merged['teamNames'] == expected['dictionaries']['team']
+    assert merged['valid'] == expected['sort']['valid']
+    for column, encoded in expected['sort']['order'].items():
+        assert merged['orders'][column] == np.frombuffer(base64.b64decode(encoded), '<u2').tolist(), column
+
+def test_descending_sort_keeps_ties_in_ascending_order(tmp_path, make_table):
+    rows = (('Abbott, Andrew', 2024, 2333), ('Cole, Gerrit', 2024, 2900), ('Skenes, Paul', 2025, 1800),
+            ('Abbott, Andrew', 2025, 2677), ('Cole, Gerrit', 2025, 2900))
+    table = make_table({'FB': [95.0, 97.0, 95.0, np.nan, 97.0]}, rows)
+    columns = ['player', 'team', 'year', 'pitch_count', 'FB']
+    ordered = run_dashboard_js(tmp_path, f"""
+        currentView = {{ prefix: '' }};
+        data = hydrate(input);
+        selected = new Uint8Array(data.rows).fill(1);
+        output = {{}};
+        {json.dumps(columns)}.forEach(column => {{
+            currentSort = {{ column, direction: 'desc' }};
+            orderRows();
+            output[column] = filteredRows;
+        }});
+    """, table.to_payload())
+
+    payload = table.to_payload()
+    for column in columns:
+        values = payload['columns'][column]
+        present = [row for row in range(len(table)) if values[row] is not None]
+        missing = [row for row in range(len(table)) if values[row] is None]
+        # sorted() is stable with reverse=True too: equal values keep row order
+        assert ordered[column] == sorted(present, key=lambda row: values[row], reverse=True) + missing, column
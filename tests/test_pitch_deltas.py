@@ -0,0 +1,35 @@
+from datetime import date
+
+import numpy as np
+
+from pitch_deltas import biggest_movers, latest_movers, pitch_counts
+from pitch_warehouse import PitchWarehouse
+
+def test_movers_are_screened_by_how_often_the_pitch_was_thrown(make_table):
+    previous = make_table({'FB': [92.8, 96.1], 'CB': [80.0, 82.0]}, pitch_count=[2500, 1400])
+    current = make_table({'FB': [91.0, 96.4], 'CB': [77.0, 83.0]})
+    # Abbott throws his curveball 2% of the time: 54 pitches, too few to trust its -3.0
+    usage = make_table({'FB': [40.0, 55.0], 'CB': [2.0, 20.0]})
+
+    counts = pitch_counts(current, usage)
+    assert np.allclose(counts[:, 0], [1070.8, 825.0])
+
+    movers = biggest_movers(current, previous, usage=usage)
+    assert [(m.name, m.pitch, round(m.change, 1)) for m in movers] == [
+        ('Abbott, Andrew', 'FB', -1.8),
+        ('Cole, Gerrit', 'CB', 1.0),
+        ('Cole, Gerrit', 'FB', 0.3),
+    ]
+    # Screening on the total pitch count alone lets the curveball through
+    assert biggest_movers(current, previous)[0].pitch == 'CB'
+
+def test_latest_movers_reads_usage_from_the_pitch_mix_leaderboard(tmp_path, make_table):
+    with PitchWarehouse(tmp_path / 'warehouse.sqlite') as warehouse:
+        for day, velocity in ((date(2025, 9, 1), [92.8, 96.1]), (date(2025, 9, 8), [91.0, 96.4])):
+            warehouse.put_table('velocity', make_table({'FB': velocity, 'CB': [80.0, 82.0]}), scrape_date=day)
+        usage = make_table({'FB': [40.0, 55.0], 'CB': [2.0, 20.0]}, pitch_count=[2677, 60])
+        warehouse.put_table('pitch mix', usage, scrape_date=date(2025, 9, 8))
+
+        movers = latest_movers(warehouse, 'velocity')
+        # Cole has thrown 33 fastballs, so only Abbott's change is listed
+        assert [(m.name, m.pitch) for m in movers] == [('Abbott, Andrew', 'FB')]
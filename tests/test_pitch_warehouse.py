@@ -0,0 +1,24 @@
+from datetime import date
+
+import numpy as np
+
+from pitch_warehouse import PitchWarehouse
+
+def test_version_ignores_rescrapes_of_unchanged_data(tmp_path, make_table):
+    with PitchWarehouse(tmp_path / 'warehouse.sqlite') as warehouse:
+        warehouse.put_table('velocity', make_table({'FB': [92.8, 96.1]}), scrape_date=date(2025, 9, 1))
+        first = warehouse.version('velocity')
+        warehouse.put_table('velocity', make_table({'FB': [92.8, 96.1]}), scrape_date=date(2025, 9, 8))
+        assert warehouse.version('velocity') == first
+
+        warehouse.put_table('velocity', make_table({'FB': [93.1, 96.1]}), scrape_date=date(2025, 9, 15))
+        assert warehouse.version('velocity') != first
+
+def test_snapshot_as_of_reads_earlier_scrape(tmp_path, make_table):
+    with PitchWarehouse(tmp_path / 'warehouse.sqlite') as warehouse:
+        warehouse.put_table('velocity', make_table({'FB': [92.8, 96.1]}), scrape_date=date(2025, 9, 1))
+        warehouse.put_table('velocity', make_table({'FB': [93.1, np.nan]}), scrape_date=date(2025, 9, 8))
+        latest = warehouse.snapshot('velocity')
+        earlier = warehouse.snapshot('velocity', as_of=date(2025, 9, 1))
+        assert latest.pitches['FB'][0] == 93.1 and np.isnan(latest.pitches['FB'][1])
+        assert earlier.pitches['FB'].tolist() == [92.8, 96.1]
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import numpy as np
+
+from pitcher_data import PITCH_TYPES, PitcherSeasonTable, join_tables
+from table_csv import iter_table_rows
+
+SAVED_PAGE = Path(__file__).resolve().parent.parent / 'abbott_from_savant.html'
+
+def test_parses_rendered_savant_table():
+    rows = list(iter_table_rows(SAVED_PAGE.read_text(encoding='utf-8')))
+    table = PitcherSeasonTable.from_rows(rows[0], rows[1:])
+
+    assert table.names == ['Abbott, Andrew'] * 3
+    assert table.year.tolist() == [2024, 2023, 2025]
+    assert table.pitch_count.tolist() == [2333, 1897, 2677]
+    assert table.pitches['FB'].tolist() == [92.8, 92.7, 92.8]
+    assert table.pitches['SWP'].tolist() == [82.9, 82.9, 82.8]
+    # '--' means the pitch was not thrown
+    assert np.isnan(table.pitches['SNK'][0]) and table.pitches['SNK'][1] == 92.5
+
+def test_join_tables_outer_joins_on_player_and_season():
+    velocity = PitcherSeasonTable(
+        names=['Abbott, Andrew', 'Cole, Gerrit', 'Unknown, Pitcher'],
+        teams=['CIN', 'NYY', 'Free Agent'],
+        player_id=[671096, 543037, 0],
+        year=[2025, 2025, 2025],
+        pitch_count=[2677, 1500, 60],
+        pitches={'FB': [92.8, 96.1, 90.0]},
+    )
+    mix = PitcherSeasonTable(
+        names=['Abbott, Andrew', 'Abbott, Andrew', 'Unknown, Pitcher'],
+        teams=['CIN', 'CIN', 'Free Agent'],
+        player_id=[671096, 671096, 0],
+        year=[2024, 2025, 2025],
+        pitch_count=[2333, 2677, 60],
+        pitches={'FB': [41.0, 38.5, 70.0]},
+    )
+    joined = join_tables({'velocity': velocity, 'mix': mix})
+
+    assert list(joined.pitches) == [f'{group}.{code}' for group in ('velocity', 'mix') for code in PITCH_TYPES]
+    rows = {
+        (pid, year): (velocity_fb, mix_fb)
+        for pid, year, velocity_fb, mix_fb in zip(
+            joined.player_id.tolist(), joined.year.tolist(),
+            joined.pitches['velocity.FB'].tolist(), joined.pitches['mix.FB'].tolist(),
+        )
+        if pid
+    }
+    assert len(joined) == 5
+    assert rows[(671096, 2025)] == (92.8, 38.5)
+    assert rows[(543037, 2025)][0] == 96.1 and np.isnan(rows[(543037, 2025)][1])
+    assert np.isnan(rows[(671096, 2024)][0]) and rows[(671096, 2024)][1] == 41.0
+    # Rows without a player_id are never merged, even with the same name and season
+    unkeyed = joined.take(joined.player_id == 0)
+    assert unkeyed.names == ['Unknown, Pitcher'] * 2
+    assert sorted(np.nan_to_num(unkeyed.pitches['velocity.FB']).tolist()) == [0.0, 90.0]
+    assert sorted(np.nan_to_num(unkeyed.pitches['mix.FB']).tolist()) == [0.0, 70.0]
+
+def test_league_aggregates_skip_pitchers_who_do_not_throw_the_pitch(make_table):
+    rows = (('Abbott, Andrew', 2025, 3000), ('Cole, Gerrit', 2025, 1000), ('Skenes, Paul', 2025, 2000))
+    table = make_table({'FB': [92.0, 96.0, np.nan], 'KN': [np.nan] * 3}, rows)
+    assert table.league_average('FB') == 94.0
+    assert table.league_average('FB', weighted=True) == 93.0
+    assert table.percentile('FB', 50) == 94.0
+    assert np.isnan(table.league_average('KN')) and np.isnan(table.percentile('KN', 50))
+
+def test_percentile_ranks_share_ranks_between_equal_values(make_table):
+    rows = tuple(('Abbott, Andrew', year, 2000) for year in range(2020, 2025))
+    table = make_table({'FB': [95.0, 92.0, 95.0, np.nan, 97.0], 'SL': [85.0] + [np.nan] * 4}, rows)
+    ranks = table.percentile_ranks('FB')
+    # Ranks 0..3 over four values; the two 95.0s share (1 + 2) / 2
+    assert ranks[[1, 0, 2, 4]].tolist() == [0.0, 50.0, 50.0, 100.0]
+    assert np.isnan(ranks[3])
+    # Row order does not change a value's rank
+    swapped = make_table({'FB': [95.0, 95.0, 92.0, np.nan, 97.0]}, rows).percentile_ranks('FB')
+    assert swapped[[0, 1]].tolist() == [50.0, 50.0]
+    assert table.percentile_ranks('SL')[0] == 100.0
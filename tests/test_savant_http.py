@@ -0,0 +1,100 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+import requests
+
+from http_retry import make_session
+from pitcher_data import PitcherSeasonTable
+from savant_http import fetch_leaderboard_csv
+
+# A recorded CSV export (byte-order mark and CRLF line endings as Savant sends it)
+RECORDED_EXPORT = (Path(__file__).parent / 'data' / 'savant_velocity_2025.csv').read_bytes()
+
+class SavantStandIn(BaseHTTPRequestHandler):
+    """Answers with the server's queued (status, content type, body) responses, then the export."""
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        if self.server.responses:
+            status, content_type, body = self.server.responses.pop(0)
+        else:
+            status, content_type, body = 200, 'text/csv', RECORDED_EXPORT
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def savant():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SavantStandIn)
+    server.paths, server.responses = [], []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f'http://127.0.0.1:{server.server_port}/leaderboard/custom?year=2025&type=pitcher'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_export_is_streamed_into_a_table(savant):
+    csv_content = fetch_leaderboard_csv(savant.url, session=make_session(backoff_factor=0))
+    assert savant.paths == ['/leaderboard/custom?year=2025&type=pitcher&csv=true']
+    table = PitcherSeasonTable.from_csv_text(csv_content)
+    assert table.names == ['Abbott, Andrew', 'Alcantara, Sandy', 'Burnes, Corbin']
+    assert table.player_id.tolist() == [671096, 645261, 669203]
+    assert table.pitch_count.tolist() == [2677, 2805, 1019]
+    assert table.pitches['FB'].tolist() == [92.8, 97.6, 95.3]
+
+def test_server_errors_are_retried(savant):
+    savant.responses = [(503, 'text/plain', b'busy'), (502, 'text/plain', b'bad gateway')]
+    csv_content = fetch_leaderboard_csv(savant.url, session=make_session(backoff_factor=0))
+    assert len(savant.paths) == 3
+    assert csv_content.startswith('"last_name, first_name",player_id,year')
+
+def test_retries_give_up_and_html_is_rejected(savant):
+    savant.responses = [(503, 'text/plain', b'busy')] * 3
+    with pytest.raises(requests.RequestException):
+        fetch_leaderboard_csv(savant.url, session=make_session(retries=2, backoff_factor=0))
+    assert len(savant.paths) == 3
+
+    savant.responses = [(200, 'text/html; charset=utf-8', b'<html>Please enable JavaScript</html>')]
+    with pytest.raises(ValueError):
+        fetch_leaderboard_csv(savant.url, session=make_session(backoff_factor=0))
+
+class RenderedPage:
+    """Browser stand-in that has already rendered the leaderboard table."""
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        return self
+
+    def execute_script(self, script, table):
+        return (
+            '<table><tr><th>Player</th><th>Year</th><th>Pitches</th><th>4-Seam Avg MPH</th></tr>'
+            '<tr><td><a href="/savant-player/andrew-abbott-671096">Abbott, Andrew</a></td>'
+            '<td>2025</td><td>2,677</td><td>92.8</td></tr></table>'
+        )
+
+def test_auto_mode_falls_back_to_the_browser(savant, monkeypatch):
+    weekly_data_update = pytest.importorskip('weekly_data_update')
+    monkeypatch.setattr(weekly_data_update, 'http_session', make_session(retries=1, backoff_factor=0))
+    monkeypatch.setattr(weekly_data_update, 'wait_for_table_ready', lambda driver, timeout: (None, 0, 1))
+    savant.responses = [(500, 'text/plain', b'error')] * 2
+    browser = RenderedPage()
+
+    csv_content = weekly_data_update.scrape_savant_table(savant.url, session=browser, mode='auto')
+    assert len(savant.paths) == 2 and browser.urls == [savant.url]
+    table = PitcherSeasonTable.from_csv_text(csv_content)
+    assert table.player_id.tolist() == [671096] and table.pitch_count.tolist() == [2677]
+
+    # 'http' mode never starts a browser
+    savant.responses = [(500, 'text/plain', b'error')] * 2
+    with pytest.raises(requests.RequestException):
+        weekly_data_update.scrape_savant_table(savant.url, session=browser, mode='http')
+    assert browser.urls == [savant.url]
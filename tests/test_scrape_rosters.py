@@ -0,0 +1,56 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('bs4')
+
+import http_retry
+import scrape_rosters
+from scrape_rosters import fetch_all_rosters
+
+ROSTER_PAGE = b'''<html><body>
+<a href="/player/andrew-abbott-671096">Abbott</a>
+<a href="/player/671096">Andrew Abbott</a>
+<a href="/player/668881">Hunter Greene</a>
+</body></html>'''
+
+class RosterStandIn(BaseHTTPRequestHandler):
+    """Serves /reds/roster; every other team's page is a server error."""
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        if self.path == '/reds/roster':
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(ROSTER_PAGE)))
+            self.end_headers()
+            self.wfile.write(ROSTER_PAGE)
+        else:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def test_failed_roster_pages_are_reported_not_empty(monkeypatch, capsys):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RosterStandIn)
+    server.paths = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base = f'http://127.0.0.1:{server.server_port}'
+        monkeypatch.setattr(scrape_rosters, 'TEAM_ROSTERS', {'CIN': f'{base}/reds/roster', 'NYY': f'{base}/yankees/roster'})
+        monkeypatch.setattr(scrape_rosters, 'MIN_INTERVAL', 0)
+        monkeypatch.setattr(http_retry, 'BACKOFF_FACTOR', 0)
+
+        assert fetch_all_rosters(max_workers=2) == {671096: 'CIN', 668881: 'CIN'}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    output = capsys.readouterr().out
+    assert 'NYY: failed' in output and 'CIN: done' in output
+    assert 'Failed rosters (1): NYY' in output
+    # The session retried the failing page before giving up
+    assert server.paths.count('/yankees/roster') == 1 + http_retry.RETRIES
@@ -0,0 +1,21 @@
+from table_csv import html_table_to_csv, iter_table_rows
+
+TABLE = """<table>
+<thead><tr><th>Rk.</th><th>Player</th><th>Pitches</th></tr></thead>
+<tbody>
+<tr><td>1</td><td><a href="/savant-player/andrew-abbott-671096?stats=statcast">Abbott, Andrew</a></td><td>2,677</td></tr>
+<tr><td>2</td><td>No Link, Player</td><td>12</td></tr>
+</tbody>
+</table>"""
+
+def test_player_ids_come_from_player_links():
+    assert list(iter_table_rows(TABLE, player_ids=True)) == [
+        ['Rk.', 'Player', 'Pitches', 'player_id'],
+        ['1', 'Abbott, Andrew', '2,677', '671096'],
+        ['2', 'No Link, Player', '12', ''],
+    ]
+
+def test_rows_split_across_chunks_and_quoted():
+    chunks = [TABLE[i:i + 7] for i in range(0, len(TABLE), 7)]
+    assert list(iter_table_rows(chunks)) == list(iter_table_rows(TABLE))
+    assert html_table_to_csv(TABLE).splitlines()[1] == '1,"Abbott, Andrew","2,677"'
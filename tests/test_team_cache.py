@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+from team_cache import TeamCache
+
+NOW = datetime(2025, 9, 8, 12, 0)
+
+def test_stale_ids_are_missing_or_past_the_ttl(tmp_path):
+    with TeamCache(tmp_path / 'teams.sqlite', ttl_days=7) as cache:
+        cache.put_many([(671096, 'CIN', 'api')], verified_at=NOW - timedelta(days=7))
+        cache.put_many([(543037, 'NYY', 'api')], verified_at=NOW - timedelta(days=7, seconds=1))
+        # Exactly one TTL old is still fresh; a second older, or never cached, is stale
+        assert cache.stale_ids([671096, 543037, 669203], now=NOW) == [543037, 669203]
+        assert cache.stale_ids([671096], now=NOW + timedelta(seconds=1)) == [671096]
+        assert cache.stale_ids([], now=NOW) == []
+
+def test_upsert_keeps_the_cached_name(tmp_path):
+    with TeamCache(tmp_path / 'teams.sqlite') as cache:
+        cache.put_many([(671096, 'CIN', 'roster', 'Abbott, Andrew')], verified_at=NOW - timedelta(days=30))
+        cache.put_many([(671096, 'NYY', 'api')], verified_at=NOW)
+        assert cache.entries() == {671096: ('NYY', 'api')}
+        assert cache.name_map() == {'Abbott, Andrew': 'NYY'}
+        assert cache.stale_ids([671096], now=NOW) == []
+
+        cache.put_many([(671096, 'NYY', 'api', 'Abbott, Andy')], verified_at=NOW)
+        assert cache.name_map() == {'Abbott, Andy': 'NYY'}
+        assert cache.get(671096) == 'NYY' and cache.get(543037) is None
+
+def test_cache_persists_between_connections(tmp_path):
+    path = tmp_path / 'teams.sqlite'
+    with TeamCache(path) as cache:
+        cache.put_many([(671096, 'CIN', 'api')])
+    with TeamCache(path) as cache:
+        assert cache.team_map() == {671096: 'CIN'}
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('selenium')
+
+import browser_session
+import weekly_data_update
+from pitcher_data import PitcherSeasonTable
+from weekly_data_update import join_teams, scrape_leaderboards, scraped_players
+
+# A rendered leaderboard as the browser fallback scrapes it: rank first
+RENDERED_CSV = (
+    'Rk.,Player,Year,Pitches,4-Seam Avg MPH,player_id\n'
+    '1,"Abbott, Andrew",2025,"2,677",92.8,671096\n'
+    '2,"Unknown, Pitcher",2025,40,90.1,\n'
+)
+
+def test_scraped_players_reads_the_name_column():
+    assert scraped_players(RENDERED_CSV) == {671096: 'Abbott, Andrew'}
+
+def test_join_teams_inserts_team_after_the_name():
+    csv_content, unmatched = join_teams(RENDERED_CSV, {671096: 'CIN'}, {})
+    assert csv_content.splitlines()[:2] == [
+        'Rk.,Player,Team,Year,Pitches,4-Seam Avg MPH,player_id',
+        '1,"Abbott, Andrew",CIN,2025,"2,677",92.8,671096',
+    ]
+    assert unmatched == ['Unknown, Pitcher']
+    table = PitcherSeasonTable.from_csv_text(csv_content)
+    assert table.teams == ['CIN', 'Free Agent'] and table.pitch_count.tolist() == [2677, 40]
+
+class FakeChrome:
+    """Stands in for webdriver.Chrome: every page is an already rendered one-row table."""
+    current_window_handle = 'main'
+
+    def get(self, url):
+        time.sleep(0.05)  # Long enough for the other workers to want a browser too
+        self.url = url
+
+    def execute_script(self, script, table):
+        return (
+            '<table><tr><th>Player</th><th>Year</th><th>Pitches</th></tr>'
+            f'<tr><td>Abbott, Andrew</td><td>{self.url[-4:]}</td><td>2,677</td></tr></table>'
+        )
+
+    def quit(self):
+        pass
+
+def test_browser_fallbacks_share_one_chrome(monkeypatch):
+    starts = []
+    def start(session):
+        starts.append(session)
+        return FakeChrome()
+    def export_fails(url, session=None, timeout=30):
+        raise ValueError('Expected CSV export, got text/html')
+    monkeypatch.setattr(browser_session.BrowserSession, '_start', start)
+    monkeypatch.setattr(weekly_data_update, 'fetch_leaderboard_csv', export_fails)
+    monkeypatch.setattr(weekly_data_update, 'wait_for_table_ready', lambda driver, timeout: (None, 0, 2))
+    monkeypatch.setattr(weekly_data_update, 'SAVANT_MIN_INTERVAL', 0)
+
+    leaderboards = [(f'velocity {year}', f'https://baseballsavant.mlb.com/leaderboard/custom?year={year}')
+                    for year in (2023, 2024, 2025)]
+    results = scrape_leaderboards(leaderboards, max_workers=3)
+
+    assert len(starts) == 1
+    assert [result.error for result in results.values()] == [None] * 3
+    assert results['velocity 2024'].value.splitlines()[1] == '"Abbott, Andrew",2024,"2,677",'
+
+def test_csv_exports_download_concurrently(monkeypatch):
+    lock = threading.Lock()
+    running, most_running = [0], [0]
+    def slow_export(url, session=None, timeout=30):
+        with lock:
+            running[0] += 1
+            most_running[0] = max(most_running[0], running[0])
+        time.sleep(0.2)
+        with lock:
+            running[0] -= 1
+        return 'Player,Year\n"Abbott, Andrew",2025\n'
+    monkeypatch.setattr(browser_session.BrowserSession, '_start', lambda session: pytest.fail('started Chrome'))
+    monkeypatch.setattr(weekly_data_update, 'fetch_leaderboard_csv', slow_export)
+    monkeypatch.setattr(weekly_data_update, 'SAVANT_MIN_INTERVAL', 0)
+
+    leaderboards = [(f'velocity {year}', f'https://baseballsavant.mlb.com/leaderboard/custom?year={year}')
+                    for year in (2022, 2023, 2024, 2025)]
+    start = time.perf_counter()
+    results = scrape_leaderboards(leaderboards, max_workers=4)
+
+    assert most_running[0] == 4
+    assert time.perf_counter() - start < 0.6
+    assert all(result.seconds < 0.4 for result in results.values())
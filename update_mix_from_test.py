@@ -1,52 +1,27 @@
 #!/usr/bin/env python3
 """
-Update pitch mix data in combined_pitcher_dashboard_final.html
-using rows from test pitcher mix.csv (matching by Player Name, Team, year).
+Hot-fix pitch mix data in the combined dashboard (index.html)
+using rows from test pitcher mix.csv (matching by player_id and year,
+or by Player Name, Team and year for rows without an id).
+Only the affected seasons are rewritten; see dashboard_patch.py.
 """
 from pathlib import Path
-import csv
-import io
+from dashboard_patch import patch_view
+from pitcher_data import load_table
 
 workspace = Path(__file__).parent
-html_path = workspace / "combined_pitcher_dashboard_final.html"
+html_path = workspace / "index.html"
 test_csv_path = workspace / "Test Pitchers - Copy of 2023-2025 pitch mix TABLE FINAL.csv"
+VIEW = "mix"
 
-# Load test CSV rows into dict
-with open(test_csv_path, "r", encoding="utf-8") as f:
-    reader = csv.reader(f)
-    test_rows = list(reader)
+def main():
+    test_table = load_table(test_csv_path)
+    if not len(test_table):
+        raise SystemExit("Test CSV is empty.")
 
-if not test_rows:
-    raise SystemExit("Test CSV is empty.")
+    updated, added = patch_view(html_path, VIEW, test_table)
+    print(f"Patched pitch mix data in {html_path.name} from {test_csv_path.name}: "
+          f"{updated} rows updated, {added} rows added.")
 
-header = test_rows[0]
-
-def make_key(row):
-    return (row[0], row[1], row[2])
-
-test_map = {make_key(row): row for row in test_rows[1:]}
-
-# Read HTML
-html_text = html_path.read_text(encoding="utf-8")
-start_tag = '<script type="text/csv" id="mix-csvData">'
-start_idx = html_text.find(start_tag)
-if start_idx == -1:
-    raise SystemExit("mix-csvData block not found.")
-
-start_idx += len(start_tag)
-end_tag = "</script>"
-end_idx = html_text.find(end_tag, start_idx)
-if end_idx == -1:
-    raise SystemExit("End of mix-csvData block not found.")
-
-# Replace entire CSV block with test CSV data
-output = io.StringIO()
-writer = csv.writer(output, lineterminator='\n')
-writer.writerows(test_rows)
-new_csv_block = output.getvalue()
-
-# Replace block in HTML
-new_html = html_text[:start_idx] + "\n" + new_csv_block + html_text[end_idx:]
-html_path.write_text(new_html, encoding="utf-8")
-
-print(f"Replaced entire pitch mix data with {len(test_rows)-1} rows from {test_csv_path.name}.")
+if __name__ == '__main__':
+    main()
@@ -1,39 +1,93 @@
 #!/usr/bin/env python3
 """
 Automated weekly data update for pitcher statistics.
-- Scrapes Baseball Savant pitch mix and velocity data
+- Scrapes Baseball Savant pitch mix and velocity data one season at a time
+  (the current season each run; older seasons once, or all with --all-seasons)
 - Adds team information
+- Stores every scrape in the pitch warehouse and exports the latest
+  snapshot of each leaderboard as CSV
+- Compares the new scrape with the previous one for velocity and usage movers
 - Rebuilds interactive dashboards
+- Publishes the exports and dashboards together, each file written
+  atomically, so a killed run never leaves a half-written page
 - Logs all activity
 """
 
 import csv
+import io
 import json
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import html as html_module
+import requests
+import build_combined_dashboard
+import build_dashboard
+import build_pitch_mix_dashboard
+from assign_teams import refresh_teams
+from atomic_output import OutputGeneration, write_text_atomic
+from build_manifest import BuildManifest
+from dashboard_template import prune_assets, referenced_assets
+from http_retry import make_session
+from browser_session import BrowserSession, BrowserPool, wait_for_table_ready
+from pitch_deltas import latest_movers
+from pitch_warehouse import PitchWarehouse
+from pitcher_data import PitcherSeasonTable, find_column
+from savant_http import fetch_leaderboard_csv
+from scrape_scheduler import HostRateLimiter, run_scrapes
+from table_csv import html_table_to_csv
+from team_cache import TeamCache
 
 # Configuration
 WORKSPACE = Path(__file__).parent
 LOG_FILE = WORKSPACE / 'update_log.json'
 TEAMS_CACHE = WORKSPACE / 'team_rosters.json'
+TEAM_CACHE_DB = WORKSPACE / 'team_cache.sqlite'
+WAREHOUSE_DB = WORKSPACE / 'pitch_warehouse.sqlite'
 
-# Savant URLs
-URL_PITCH_MIX = "https://baseballsavant.mlb.com/leaderboard/custom?year=2025%2C2024%2C2023&type=pitcher&filter=&min=50&selections=pitch_count%2Cn_ff_formatted%2Cn_sl_formatted%2Cn_ch_formatted%2Cn_cu_formatted%2Cn_si_formatted%2Cn_fc_formatted%2Cn_fs_formatted%2Cn_kn_formatted%2Cn_st_formatted%2Cn_sv_formatted%2Cn_fo_formatted&chart=false&x=n_ff_formatted&y=n_ff_formatted&r=no&chartType=beeswarm&sort=player_name&sortDir=asc"
-URL_VELOCITIES = "https://baseballsavant.mlb.com/leaderboard/custom?year=2025%2C2024%2C2023&type=pitcher&filter=&min=50&selections=pitch_count%2Cff_avg_speed%2Csl_avg_speed%2Cch_avg_speed%2Ccu_avg_speed%2Csi_avg_speed%2Cfc_avg_speed%2Cfs_avg_speed%2Ckn_avg_speed%2Cst_avg_speed%2Csv_avg_speed%2Cfo_avg_speed&chart=false&x=ff_avg_speed&y=ff_avg_speed&r=no&chartType=beeswarm&sort=player_name&sortDir=asc"
+# Savant URLs, one season per request ({year} is filled in per partition)
+URL_PITCH_MIX = "https://baseballsavant.mlb.com/leaderboard/custom?year={year}&type=pitcher&filter=&min=50&selections=pitch_count%2Cn_ff_formatted%2Cn_sl_formatted%2Cn_ch_formatted%2Cn_cu_formatted%2Cn_si_formatted%2Cn_fc_formatted%2Cn_fs_formatted%2Cn_kn_formatted%2Cn_st_formatted%2Cn_sv_formatted%2Cn_fo_formatted&chart=false&x=n_ff_formatted&y=n_ff_formatted&r=no&chartType=beeswarm&sort=player_name&sortDir=asc"
+URL_VELOCITIES = "https://baseballsavant.mlb.com/leaderboard/custom?year={year}&type=pitcher&filter=&min=50&selections=pitch_count%2Cff_avg_speed%2Csl_avg_speed%2Cch_avg_speed%2Ccu_avg_speed%2Csi_avg_speed%2Cfc_avg_speed%2Cfs_avg_speed%2Ckn_avg_speed%2Cst_avg_speed%2Csv_avg_speed%2Cfo_avg_speed&chart=false&x=ff_avg_speed&y=ff_avg_speed&r=no&chartType=beeswarm&sort=player_name&sortDir=asc"
 
-# Output files
+# Seasons on the dashboards; Statcast leaderboards go back to 2015
+FIRST_SEASON = 2023
+SEASON_START_MONTH = 4  # Before April the newest season with data is last year's
+
+# How leaderboards are fetched: 'auto' (CSV export, browser fallback), 'http' or 'browser'
+SCRAPE_MODE = 'auto'
+
+# Scrape concurrency
+MAX_CONCURRENT_SCRAPES = 2
+MAX_BROWSERS = 1  # One Chrome cold start per run; concurrent fallbacks take turns on it
+SAVANT_MIN_INTERVAL = 1.0  # Seconds between page loads on baseballsavant.mlb.com
+
+# Output files (the CSVs are exports of the latest warehouse snapshot)
 OUT_PITCH_MIX_CSV = WORKSPACE / 'Test Pitchers - Copy of 2023-2025 pitch mix.csv'
 OUT_VELOCITIES_CSV = WORKSPACE / 'Test Pitchers - Copy of 2023-2025 pitch velos.csv'
 OUT_MIX_DASHBOARD = WORKSPACE / 'pitcher_pitch_mix_dashboard.html'
 OUT_VELO_DASHBOARD = WORKSPACE / 'pitcher_dashboard.html'
+OUT_COMBINED_DASHBOARD = WORKSPACE / 'index.html'
+
+BUILD_MANIFEST = WORKSPACE / 'dashboard_manifest.json'
+
+# Dashboards rebuilt each run: (leaderboard names, builder module, output HTML)
+DASHBOARDS = [
+    (['pitch mix'], build_pitch_mix_dashboard, OUT_MIX_DASHBOARD),
+    (['velocity'], build_dashboard, OUT_VELO_DASHBOARD),
+    (['pitch mix', 'velocity'], build_combined_dashboard, OUT_COMBINED_DASHBOARD),
+]
+# 'assets' shares hashed CSS/JS/data files between pages; 'inline' writes standalone pages
+PUBLISH_MODE = 'assets'
+
+# Keep-alive connection shared by CSV export downloads (retries 5xx with backoff)
+http_session = make_session()
+
+# Leaderboards scraped each run: (warehouse name, url template, export CSV)
+LEADERBOARDS = [
+    ('pitch mix', URL_PITCH_MIX, OUT_PITCH_MIX_CSV),
+    ('velocity', URL_VELOCITIES, OUT_VELOCITIES_CSV),
+]
 
 class Logger:
     """Simple logging system for update tracking."""
@@ -61,69 +115,83 @@ class Logger:
         print(f"[{status}] {message}")
     
     def save_logs(self):
-        with open(self.log_file, 'w') as f:
-            json.dump(self.logs[-100:], f, indent=2)  # Keep last 100 entries
+        write_text_atomic(self.log_file, json.dumps(self.logs[-100:], indent=2))  # Keep last 100 entries
     
     def get_last_update(self):
         if self.logs:
             return self.logs[-1]['timestamp']
         return None
 
-def scrape_savant_table(url, timeout=60):
-    """Scrape a Savant leaderboard table and return CSV content."""
-    options = webdriver.ChromeOptions()
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--headless')  # Run in background
+def scrape_savant_table(url, timeout=60, session=None, mode=None, pool=None):
+    """Scrape a Savant leaderboard table and return CSV content.
+
+    mode 'http' downloads the leaderboard's CSV export, 'browser' renders
+    the page in Chrome, and 'auto' (the default, see SCRAPE_MODE) tries the
+    export first and only falls back to the browser if it fails.
+    Pass a shared BrowserSession to reuse one browser across URLs, or a
+    BrowserPool to borrow one only if the browser is actually needed;
+    without either a temporary session is started and closed here.
+    """
+    mode = mode or SCRAPE_MODE
+    if mode in ('http', 'auto'):
+        try:
+            return fetch_leaderboard_csv(url, session=http_session, timeout=timeout)
+        except (requests.RequestException, ValueError) as e:
+            if mode == 'http':
+                raise
+            print(f"  CSV export failed ({e}), falling back to browser")
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    if session is None and pool is not None:
+        with pool.acquire() as pooled_session:
+            return scrape_savant_table(url, timeout, pooled_session, mode='browser')
+    if session is None:
+        with BrowserSession() as temp_session:
+            return scrape_savant_table(url, timeout, temp_session, mode='browser')
     
-    try:
-        driver.get(url)
-        
-        # Wait for table to load
-        wait = WebDriverWait(driver, timeout)
-        table = wait.until(EC.presence_of_element_located((By.TAG_NAME, 'table')))
-        time.sleep(2)  # Extra time for JS rendering
-        
-        # Extract table HTML
-        table_html = driver.execute_script('return arguments[0].outerHTML;', table)
-        
-        # Parse HTML table to CSV
-        csv_content = html_table_to_csv(table_html)
-        return csv_content
+    driver = session.get(url)
+    
+    # Wait until the table stops growing
+    table, _, _ = wait_for_table_ready(driver, timeout)
+    
+    # One round-trip for the whole table, then parse it as a stream
+    table_html = driver.execute_script('return arguments[0].outerHTML;', table)
+    return html_table_to_csv(table_html, player_ids=True)
+
+def current_season(today=None):
+    """Newest season with leaderboard data."""
+    today = today or datetime.now()
+    return today.year if today.month >= SEASON_START_MONTH else today.year - 1
+
+def season_jobs(leaderboards, seasons, warehouse, refresh_all=False):
+    """
+    Return (job name, url, leaderboard name, year) for each season to scrape:
+    the newest season every run, finished seasons only when the warehouse
+    has no scrape of them yet (or refresh_all is set).
+    """
+    newest = max(seasons)
+    jobs = []
+    for name, url, _ in leaderboards:
+        stored = set(warehouse.seasons(name))
+        for year in seasons:
+            if refresh_all or year == newest or year not in stored:
+                jobs.append((f'{name} {year}', url.format(year=year), name, year))
+    return jobs
+
+def scrape_leaderboards(leaderboards, max_workers=MAX_CONCURRENT_SCRAPES):
+    """Scrape (name, url, ...) leaderboards concurrently.
+    CSV exports download in parallel; the pool's browser only starts if
+    one of them fails, and is then shared by every fallback in the run."""
+    rate_limiter = HostRateLimiter(SAVANT_MIN_INTERVAL)
+    
+    with BrowserPool(size=min(MAX_BROWSERS, max_workers)) as pool:
+        def fetch(url):
+            return scrape_savant_table(url, pool=pool)
         
-    finally:
-        driver.quit()
-
-def html_table_to_csv(table_html):
-    """Convert HTML table to CSV format."""
-    from bs4 import BeautifulSoup
-    
-    soup = BeautifulSoup(table_html, 'html.parser')
-    rows = []
-    
-    for tr in soup.find_all('tr'):
-        cells = []
-        for td in tr.find_all(['td', 'th']):
-            text = td.get_text(strip=True)
-            cells.append(text)
-        if cells:
-            rows.append(cells)
-    
-    # Convert to CSV format
-    csv_lines = []
-    for row in rows:
-        # Quote fields if they contain commas
-        quoted_row = [f'"{cell}"' if ',' in cell else cell for cell in row]
-        csv_lines.append(','.join(quoted_row))
-    
-    return '\n'.join(csv_lines)
-
-def load_team_roster():
-    """Load cached team roster data."""
+        jobs = [(name, url) for name, url, *_ in leaderboards]
+        return run_scrapes(jobs, fetch, max_workers=max_workers, rate_limiter=rate_limiter)
+
+def load_team_roster(team_cache=None):
+    """Load cached team roster data, keyed by player name."""
     team_map = {}
     
     # Try to load from cache first
@@ -143,91 +211,226 @@ def load_team_roster():
                 if 'Player' in row and 'Team' in row:
                     team_map[row['Player']] = row['Team']
     
+    # Verified entries in the team cache win over the older files
+    if team_cache is not None:
+        team_map.update(team_cache.name_map())
+    
     return team_map
 
-def add_team_to_csv(csv_content, team_map):
-    """Add team column to CSV if not present."""
-    lines = csv_content.strip().split('\n')
-    headers = lines[0].split(',')
+def scraped_players(csv_content):
+    """Return player_id -> display name for a scraped CSV, if it has a player_id column."""
+    reader = csv.reader(io.StringIO(csv_content))
+    header = next(reader, [])
+    id_index = find_column(header, 'player_id')
+    name_index = find_column(header, 'name')
+    if id_index is None or name_index is None:
+        return {}
+    
+    players = {}
+    for row in reader:
+        try:
+            players[int(row[id_index])] = row[name_index]
+        except (IndexError, ValueError):
+            pass
+    return players
+
+def join_teams(csv_content, teams_by_id, teams_by_name=None):
+    """
+    Insert a Team column after the player name, joined on player_id.
+    Rows without a usable player_id fall back to teams_by_name.
+    Players that match neither are marked 'Free Agent' and their IDs
+    (or names) returned so the caller can report them.
+    Returns (csv_content, unmatched).
+    """
+    teams_by_name = teams_by_name or {}
+    reader = csv.reader(io.StringIO(csv_content))
+    header = next(reader, [])
     
     # Check if Team column exists
-    if 'Team' in headers:
-        return csv_content
+    if 'Team' in header:
+        return csv_content, []
     
-    # Add Team header
-    headers.insert(1, 'Team')
-    new_lines = [','.join(headers)]
+    # Rendered tables start with a rank column, so find the name by its header
+    id_index = find_column(header, 'player_id')
+    name_index = find_column(header, 'name')
+    if name_index is None:
+        raise ValueError(f'No player name column in header: {header}')
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(header[:name_index + 1] + ['Team'] + header[name_index + 1:])
     
-    # Add team data for each player
-    for line in lines[1:]:
-        cells = line.split(',')
-        if cells:
-            player_name = cells[0].strip('"')
-            team = team_map.get(player_name, 'Unknown')
-            cells.insert(1, f'"{team}"')
-            new_lines.append(','.join(cells))
+    unmatched = []
+    for row in reader:
+        if not row:
+            continue
+        team = None
+        player_id = row[id_index] if id_index is not None and id_index < len(row) else ''
+        if player_id.isdigit():
+            team = teams_by_id.get(int(player_id))
+        name = row[name_index] if name_index < len(row) else ''
+        if team is None:
+            team = teams_by_name.get(name)
+        if team is None:
+            team = 'Free Agent'
+            unmatched.append(player_id or name)
+        writer.writerow(row[:name_index + 1] + [team] + row[name_index + 1:])
     
-    return '\n'.join(new_lines)
+    return output.getvalue(), unmatched
 
 def save_csv(content, filepath):
-    """Save CSV content to file."""
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-
-def rebuild_dashboards():
-    """Rebuild both HTML dashboards from CSV files."""
-    import subprocess
-    
-    # Run the dashboard builders
-    scripts = [
-        'build_pitch_mix_dashboard.py',
-        'build_dashboard.py'
-    ]
-    
-    for script in scripts:
-        script_path = WORKSPACE / script
-        if script_path.exists():
+    """Save CSV content to file (atomically)."""
+    write_text_atomic(filepath, content)
+
+def rebuild_dashboards(warehouse, tables=None, movers=None, force=False, generation=None):
+    """
+    Rebuild the HTML dashboards in-process and in parallel.
+    Dashboards whose warehouse snapshots and template are unchanged since
+    their last build are skipped unless force is set. tables maps
+    leaderboard name -> PitcherSeasonTable and movers leaderboard name ->
+    biggest movers; any missing are read from the warehouse. With an
+    OutputGeneration the pages, assets and manifest are staged in it
+    instead of written in place.
+    Returns dict of dashboard output name -> seconds (None if skipped).
+    """
+    manifest = BuildManifest(BUILD_MANIFEST)
+    
+    timings = {}
+    pending = []
+    for names, builder, output_path in DASHBOARDS:
+        inputs = {name: warehouse.version(name) for name in names}
+        version = f'{builder.TEMPLATE_VERSION}:{PUBLISH_MODE}'
+        if not force and manifest.is_current(output_path, inputs, version):
+            timings[output_path.name] = None
+        else:
+            pending.append((names, builder, output_path, inputs, version))
+    
+    tables = dict(tables or {})
+    for names, _, _, _, _ in pending:
+        for name in names:
+            if name not in tables:
+                tables[name] = warehouse.snapshot(name)
+    movers = dict(movers or {})
+    for names, _, _, _, _ in pending:
+        for name in names:
+            if name not in movers:
+                movers[name] = latest_movers(warehouse, name)
+    
+    updated = {output_path: warehouse.last_updated(names) for names, _, output_path, _, _ in pending}
+    
+    def run(names, builder, output_path):
+        start = time.perf_counter()
+        page_updated = updated[output_path]
+        if generation is not None:
+            output_path = generation.path(output_path)
+        builder.build(
+            *[tables[name] for name in names], output_path,
+            mode=PUBLISH_MODE, movers=movers, updated=page_updated,
+        )
+        return time.perf_counter() - start
+    
+    with ThreadPoolExecutor(max_workers=max(1, len(pending))) as executor:
+        futures = [
+            (output_path, inputs, version, executor.submit(run, names, builder, output_path))
+            for names, builder, output_path, inputs, version in pending
+        ]
+        for output_path, inputs, version, future in futures:
             try:
-                subprocess.run(['python', str(script_path)], cwd=str(WORKSPACE), timeout=120)
+                timings[output_path.name] = future.result()
+                manifest.record(output_path, inputs, version)
             except Exception as e:
-                print(f"Error rebuilding dashboard {script}: {e}")
+                print(f"Error rebuilding dashboard {output_path.name}: {e}")
+    
+    manifest.save(generation.path(BUILD_MANIFEST) if generation is not None else None)
+    return timings
 
 def main():
     """Main update routine."""
     logger = Logger(LOG_FILE)
+    team_cache = TeamCache(TEAM_CACHE_DB)
+    warehouse = PitchWarehouse(WAREHOUSE_DB)
     
     try:
         logger.add('INFO', 'Starting weekly data update...')
         
-        # Load team roster
-        logger.add('INFO', 'Loading team roster data...')
-        team_map = load_team_roster()
-        logger.add('INFO', f'Loaded {len(team_map)} player-team mappings')
+        # Scrape the current season, plus any older season not saved yet
+        seasons = list(range(FIRST_SEASON, current_season() + 1))
+        jobs = season_jobs(LEADERBOARDS, seasons, warehouse, refresh_all='--all-seasons' in sys.argv)
+        logger.add('INFO', f'Scraping {len(jobs)} Savant leaderboard seasons...')
+        results = scrape_leaderboards(jobs)
+        for job_name, *_ in jobs:
+            if results[job_name].error:
+                raise RuntimeError(f'{job_name} scrape failed: {results[job_name].error}')
+        
+        # Only look up teams for players that are new or past the cache TTL
+        logger.add('INFO', 'Refreshing team assignments...')
+        players = {}
+        for result in results.values():
+            players.update(scraped_players(result.value))
+        looked_up = refresh_teams(team_cache, players)
+        logger.add('INFO', f'Looked up {looked_up} of {len(players)} players, rest from team cache')
         
-        # Scrape pitch mix data
-        logger.add('INFO', 'Scraping Savant pitch mix data...')
-        pitch_mix_csv = scrape_savant_table(URL_PITCH_MIX)
-        pitch_mix_csv = add_team_to_csv(pitch_mix_csv, team_map)
-        save_csv(pitch_mix_csv, OUT_PITCH_MIX_CSV)
-        logger.add('SUCCESS', f'Saved pitch mix data: {OUT_PITCH_MIX_CSV.name}')
+        # Join teams on player_id; names only for rows scraped without IDs
+        teams_by_id = team_cache.team_map()
+        teams_by_name = load_team_roster(team_cache)
+        logger.add('INFO', f'Loaded {len(teams_by_id)} player-team mappings')
         
-        # Scrape velocity data
-        logger.add('INFO', 'Scraping Savant velocity data...')
-        velocities_csv = scrape_savant_table(URL_VELOCITIES)
-        velocities_csv = add_team_to_csv(velocities_csv, team_map)
-        save_csv(velocities_csv, OUT_VELOCITIES_CSV)
-        logger.add('SUCCESS', f'Saved velocity data: {OUT_VELOCITIES_CSV.name}')
+        for job_name, _, name, year in jobs:
+            result = results[job_name]
+            csv_content, unmatched = join_teams(result.value, teams_by_id, teams_by_name)
+            if unmatched:
+                sample = ', '.join(unmatched[:10])
+                logger.add('WARNING', f'{len(unmatched)} {job_name} players have no team: {sample}')
+            table = PitcherSeasonTable.from_csv_text(csv_content)
+            table.year[table.year == 0] = year  # Single-season exports may omit the year column
+            stored, skipped = warehouse.put_table(name, table)
+            if skipped:
+                logger.add('WARNING', f'{skipped} {job_name} rows have no player_id and were not stored')
+            logger.add('SUCCESS', f'Stored {job_name} data: {stored} rows ({result.seconds:.1f}s)')
         
-        # Rebuild dashboards
-        logger.add('INFO', 'Rebuilding dashboards...')
-        rebuild_dashboards()
-        logger.add('SUCCESS', 'Dashboards rebuilt successfully')
+        # Exports and dashboards are staged and go live together, only if all succeed
+        previous_assets = referenced_assets(WORKSPACE)
+        with OutputGeneration(WORKSPACE) as generation:
+            # Latest snapshot of every season, also exported as CSV
+            tables = {}
+            for name, _, out_csv in LEADERBOARDS:
+                tables[name] = warehouse.snapshot(name, seasons)
+                save_csv(tables[name].to_csv_text(), generation.path(out_csv))
+                logger.add('SUCCESS', f'Exported {name} data: {out_csv.name} ({len(tables[name])} rows)')
+        
+            # Week-over-week velocity and usage changes of the current season
+            movers = {}
+            for name, _, _ in LEADERBOARDS:
+                movers[name] = latest_movers(warehouse, name)
+                if movers[name]:
+                    top = movers[name][0]
+                    logger.add('INFO', f'{name} biggest mover: {top.name} {top.pitch} {top.change:+.1f}')
+        
+            # Rebuild dashboards
+            logger.add('INFO', 'Rebuilding dashboards...')
+            timings = rebuild_dashboards(warehouse, tables, movers, generation=generation)
+            for output_name, seconds in timings.items():
+                if seconds is None:
+                    logger.add('INFO', f'Skipped {output_name} (inputs unchanged)')
+                else:
+                    logger.add('INFO', f'Built {output_name} in {seconds:.2f}s')
+            if len(timings) < len(DASHBOARDS):
+                raise RuntimeError(f'Only {len(timings)} of {len(DASHBOARDS)} dashboards rebuilt')
+            logger.add('SUCCESS', 'Dashboards rebuilt successfully')
+        logger.add('SUCCESS', 'Published exports and dashboards')
+        
+        # Assets of the pages just replaced stay one more run for readers still on them
+        removed = prune_assets(WORKSPACE, keep=previous_assets)
+        if removed:
+            logger.add('INFO', f'Pruned {len(removed)} unreferenced asset files')
         
         logger.add('SUCCESS', 'Weekly update completed successfully!')
         
     except Exception as e:
         logger.add('ERROR', f'Update failed: {str(e)}')
         raise
+    finally:
+        team_cache.close()
+        warehouse.close()
 
 if __name__ == '__main__':
     main()